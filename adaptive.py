@@ -0,0 +1,139 @@
+import atexit
+import json
+from array import array
+
+from batch_writer import BatchWriter
+from resources import write_file_atomic
+
+_char_indexes = {}
+
+
+class CharIndex:
+    def __init__(self, words):
+        self.words = words
+        postings = {}
+        for word_id, word in enumerate(words):
+            lowered = word.lower()
+            for key in set(lowered) | {lowered[i:i + 2] for i in range(len(lowered) - 1)}:
+                ids = postings.get(key)
+                if ids is None:
+                    ids = postings[key] = array("I")
+                ids.append(word_id)
+        self.postings = postings
+
+    def word_ids(self, key):
+        return self.postings.get(key)
+
+
+def get_char_index(path, words):
+    cached = _char_indexes.get(path)
+    if cached and cached[0] is words:
+        return cached[1]
+    index = CharIndex(words)
+    _char_indexes[path] = (words, index)
+    return index
+
+
+def write_profiles(path, users):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    data.update(users)
+
+    def write(temp_path):
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    write_file_atomic(path, write)
+
+
+class ProfileWriter(BatchWriter):
+    def __init__(self):
+        super().__init__()
+        atexit.register(self.close)
+
+    def write_batch(self, batch):
+        paths = {}
+        for path, user, entry in batch:
+            paths.setdefault(path, {})[user] = entry
+        for path, users in paths.items():
+            write_profiles(path, users)
+
+    def add(self, path, user, entry):
+        self.put((path, user, entry))
+
+    def close(self):
+        if self.thread is None:
+            return
+        atexit.unregister(self.close)
+        super().close()
+        self.thread = None
+
+
+class WeaknessProfile:
+    def __init__(self, path, user, writer=None, decay=0.8):
+        self.path = path
+        self.user = user
+        self.writer = writer
+        self.decay = decay
+        self.keys = {}
+        self.bigrams = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f).get(self.user, {})
+        except (OSError, ValueError):
+            return
+        self.keys = data.get("keys", {})
+        self.bigrams = data.get("bigrams", {})
+
+    def save(self):
+        entry = {"keys": {char: dict(stats) for char, stats in self.keys.items()},
+                 "bigrams": {pair: dict(stats) for pair, stats in self.bigrams.items()}}
+        if self.writer:
+            self.writer.add(self.path, self.user, entry)
+        else:
+            write_profiles(self.path, {self.user: entry})
+
+    def update(self, analytics):
+        if not analytics:
+            return
+        for entries in (self.keys, self.bigrams):
+            for entry in entries.values():
+                for field in entry:
+                    entry[field] *= self.decay
+        for char, stats in analytics["errors"].items():
+            entry = self.keys.setdefault(char.lower(), {"count": 0, "errors": 0, "latency_count": 0, "total_ms": 0})
+            entry["count"] += stats["count"]
+            entry["errors"] += stats["errors"]
+        for char, stats in analytics["keys"].items():
+            entry = self.keys.setdefault(char.lower(), {"count": 0, "errors": 0, "latency_count": 0, "total_ms": 0})
+            entry["latency_count"] += stats["count"]
+            entry["total_ms"] += stats["mean_ms"] * stats["count"]
+        for pair, stats in analytics["bigrams"].items():
+            entry = self.bigrams.setdefault(pair.lower(), {"count": 0, "total_ms": 0})
+            entry["count"] += stats["count"]
+            entry["total_ms"] += stats["mean_ms"] * stats["count"]
+        self.save()
+
+    def targets(self, count=5):
+        latencies = [entry["total_ms"] / entry["latency_count"] for entry in self.keys.values()
+                     if entry["latency_count"] >= 1]
+        mean_ms = sum(latencies) / len(latencies) if latencies else 0
+        scores = {}
+        for char, entry in self.keys.items():
+            if entry["count"] < 1 or char.isspace():
+                continue
+            score = (entry["errors"] + 0.1) / (entry["count"] + 5) * 20
+            if mean_ms and entry["latency_count"] >= 1:
+                score += entry["total_ms"] / entry["latency_count"] / mean_ms
+            scores[char] = score
+        pair_latencies = [entry["total_ms"] / entry["count"] for entry in self.bigrams.values() if entry["count"] >= 1]
+        pair_mean = sum(pair_latencies) / len(pair_latencies) if pair_latencies else 0
+        for pair, entry in self.bigrams.items():
+            if entry["count"] >= 1 and pair_mean:
+                scores[pair] = entry["total_ms"] / entry["count"] / pair_mean
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:count]
@@ -0,0 +1,145 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from key_analytics import percentile
+from recording import load_recording
+from replay import replay_session
+
+FIELDS = ["path", "user", "mode", "parameters", "created", "wpm", "accuracy", "errors", "time_elapsed",
+          "chars_typed", "key_errors", "error"]
+SUMMARY_FIELDS = ["user", "sessions", "wpm_mean", "wpm_p50", "wpm_p90", "wpm_p99", "accuracy_mean", "accuracy_p10",
+                  "modes", "key_errors"]
+
+
+def find_recordings(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith(".tmlog") and not name.startswith("."):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def analyze_file(path):
+    try:
+        header, events = load_recording(path)
+        game_manager = replay_session(header, events)
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}"}
+    analytics = game_manager.analytics
+    return dict(game_manager.get_stats(), path=path, user=header.get("user", "unknown"), mode=header["mode"],
+                parameters=header.get("parameters", []), created=header.get("created"),
+                key_errors={char: entry["errors"] for char, entry in analytics["errors"].items() if entry["errors"]}
+                if analytics else {})
+
+
+class ResultWriter:
+    def __init__(self, path, fields=FIELDS):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.jsonl = path.endswith(".jsonl")
+        self.writer = None if self.jsonl else csv.DictWriter(self.file, fields, extrasaction="ignore")
+        if self.writer:
+            self.writer.writeheader()
+
+    def write(self, row):
+        if self.jsonl:
+            self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            self.writer.writerow({key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list))
+                                  else value for key, value in row.items()})
+
+    def close(self):
+        self.file.close()
+
+
+class UserSummary:
+    def __init__(self):
+        self.wpm = []
+        self.accuracy = []
+        self.key_errors = Counter()
+        self.modes = Counter()
+
+    def add(self, row):
+        self.wpm.append(row["wpm"])
+        self.accuracy.append(row["accuracy"])
+        self.key_errors.update(row["key_errors"])
+        self.modes[row["mode"]] += 1
+
+    def summary(self):
+        return {
+            "sessions": len(self.wpm),
+            "wpm_mean": sum(self.wpm) / len(self.wpm),
+            "wpm_p50": percentile(self.wpm, 50),
+            "wpm_p90": percentile(self.wpm, 90),
+            "wpm_p99": percentile(self.wpm, 99),
+            "accuracy_mean": sum(self.accuracy) / len(self.accuracy),
+            "accuracy_p10": percentile(self.accuracy, 10),
+            "modes": dict(self.modes),
+            "key_errors": dict(self.key_errors.most_common())
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute stats for recorded Typemaster sessions in parallel")
+    parser.add_argument("recordings", nargs="+", help="recording files or directories with .tmlog files")
+    parser.add_argument("--output", default="sessions.csv", help="per-session results (.csv or .jsonl)")
+    parser.add_argument("--summary", help="per-user aggregates (.csv or .jsonl, defaults to the --output format)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if not args.summary:
+        args.summary = "summary" + os.path.splitext(args.output)[1]
+
+    paths = list(find_recordings(args.recordings))
+    if not paths:
+        print("Записи не найдены.")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    users = {}
+    failed = 0
+    writer = ResultWriter(args.output)
+    chunksize = max(1, len(paths) // (args.jobs * 8))
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            for row in executor.map(analyze_file, paths, chunksize=chunksize):
+                writer.write(row)
+                if "error" in row:
+                    failed += 1
+                    print(f"Не удалось обработать {row['path']}: {row['error']}")
+                    continue
+                users.setdefault(row["user"], UserSummary()).add(row)
+    finally:
+        writer.close()
+
+    summary = {user: users[user].summary() for user in sorted(users)}
+    summary_writer = ResultWriter(args.summary, SUMMARY_FIELDS)
+    try:
+        for user, data in summary.items():
+            summary_writer.write(dict(user=user, **data))
+    finally:
+        summary_writer.close()
+
+    elapsed = time.perf_counter() - started
+    for user, data in summary.items():
+        print(f"{user}: {data['sessions']} sessions, WPM p50 {data['wpm_p50']:.1f} / p90 {data['wpm_p90']:.1f}, "
+              f"accuracy {data['accuracy_mean']:.1f}%")
+    print(f"Обработано {len(paths) - failed} из {len(paths)} записей за {elapsed:.2f} с "
+          f"({len(paths) / elapsed:.0f} записей/с, {args.jobs} процессов)")
+    print(f"Результаты сохранены в {args.output} и {args.summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import queue
+import threading
+
+
+class BatchWriter:
+    def __init__(self, batch_size=256):
+        self.batch_size = batch_size
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        self.open_writer()
+        while True:
+            items = [self.pending.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            batch = [item for item in items if item is not None]
+            if batch:
+                self.write_batch(batch)
+            if len(batch) < len(items):
+                break
+        self.close_writer()
+
+    def open_writer(self):
+        pass
+
+    def write_batch(self, batch):
+        pass
+
+    def close_writer(self):
+        pass
+
+    def put(self, item):
+        self.pending.put(item)
+
+    def close(self):
+        self.pending.put(None)
+        self.thread.join()
@@ -0,0 +1,242 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from game_modes import GameManager
+from key_analytics import percentile
+from resources import load_font
+from scoreboard import Scoreboard
+from settings import Settings
+from ui import UI
+
+BENCH_MODES = [("time", 60), ("words", 100), ("zen",), ("custom", 120, 0), ("custom", 0, 1000)]
+
+
+def summarize(samples_ns):
+    samples_us = [s / 1000 for s in samples_ns]
+    return {
+        "count": len(samples_us),
+        "mean_us": sum(samples_us) / len(samples_us) if samples_us else 0,
+        "p50_us": percentile(samples_us, 50),
+        "p95_us": percentile(samples_us, 95),
+        "p99_us": percentile(samples_us, 99),
+        "max_us": max(samples_us) if samples_us else 0
+    }
+
+
+def measure_allocations(fn):
+    tracemalloc.start()
+    fn()
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    return {"alloc_blocks": blocks, "alloc_retained_kb": current / 1024, "alloc_peak_kb": peak / 1024}
+
+
+def keystrokes(game_manager, rng, error_rate=0.05):
+    while True:
+        mode = game_manager.selected_mode
+        if mode.finished:
+            game_manager.restart_session()
+            mode = game_manager.selected_mode
+        for c in mode.words[mode.current_word_index]:
+            if rng.random() < error_rate:
+                yield "x"
+                if rng.random() < 0.5:
+                    yield "\b"
+            yield c
+        yield " "
+
+
+def feed(game_manager, key):
+    if key == "\b":
+        game_manager.handle_backspace()
+    else:
+        game_manager.handle_input(key)
+
+
+def bench_word_generation(settings, font, iterations):
+    results = {}
+    for numbers, punctuation in [(False, False), (True, False), (False, True), (True, True)]:
+        settings.numbers_enabled = numbers
+        settings.punctuation_enabled = punctuation
+        game_manager = GameManager(settings, font)
+        mode = game_manager.selected_mode
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter_ns()
+            mode.create_word_list(50)
+            samples.append(time.perf_counter_ns() - start)
+        results[f"numbers={numbers},punctuation={punctuation}"] = summarize(samples)
+        mode.stop()
+    settings.numbers_enabled = False
+    settings.punctuation_enabled = False
+    return results
+
+
+def bench_game(screen, settings, font, mode_args, count, seed):
+    game_manager = GameManager(settings, font)
+    ui = UI(screen, settings, font, game_manager)
+    ui.state = "game"
+
+    def run():
+        random.seed(seed)
+        game_manager.set_mode(*mode_args)
+        rng = random.Random(seed)
+        input_samples = []
+        frame_samples = []
+        for key in itertools.islice(keystrokes(game_manager, rng), count):
+            start = time.perf_counter_ns()
+            feed(game_manager, key)
+            input_samples.append(time.perf_counter_ns() - start)
+            screen.fill(settings.bg_color)
+            start = time.perf_counter_ns()
+            ui.draw_game()
+            frame_samples.append(time.perf_counter_ns() - start)
+        game_manager.selected_mode.stop()
+        return input_samples, frame_samples
+
+    input_samples, frame_samples = run()
+    result = {"handle_input": summarize(input_samples), "draw_game": summarize(frame_samples)}
+    result.update(measure_allocations(run))
+    return result
+
+
+def bench_scoreboard(screen, settings, font, frames, seed):
+    random.seed(seed)
+    game_manager = GameManager(settings, font)
+    rng = random.Random(seed)
+    for key in itertools.islice(keystrokes(game_manager, rng), 200):
+        feed(game_manager, key)
+    game_manager.selected_mode.finish()
+    game_manager.update()
+    game_manager.selected_mode.stop()
+    scoreboard = Scoreboard(screen, settings, font)
+    scoreboard.update_score(game_manager)
+
+    def run():
+        samples = []
+        for _ in range(frames):
+            screen.fill(settings.bg_color)
+            start = time.perf_counter_ns()
+            scoreboard.draw()
+            samples.append(time.perf_counter_ns() - start)
+        return samples
+
+    result = {"draw": summarize(run())}
+    result.update(measure_allocations(run))
+    return result
+
+
+def check_wide_layout(settings, font, words, size=(3840, 1080)):
+    screen = pygame.Surface(size)
+    game_manager = GameManager(settings, font)
+    ui = UI(screen, settings, font, game_manager)
+    ui.state = "game"
+    results = {}
+    for mode_args in [("time", 120), ("custom", 120, 0)]:
+        game_manager.set_mode(*mode_args)
+        mode = game_manager.selected_mode
+        while mode.current_word_index < words:
+            for c in mode.words[mode.current_word_index] + " ":
+                game_manager.handle_input(c)
+                ui.draw_game()
+        results[":".join(str(a) for a in mode_args)] = {"words": mode.current_word_index,
+                                                         "ring_capacity": mode.words.capacity}
+        mode.stop()
+    return results
+
+
+def run_benchmarks(args):
+    pygame.init()
+    settings = Settings()
+    settings.record_sessions = False
+    settings.key_profile_path = None
+    screen = pygame.display.set_mode((args.width, args.height))
+    font = load_font(settings.font_path, settings.font_size)
+
+    results = {
+        "meta": {
+            "seed": args.seed,
+            "keystrokes": args.keystrokes,
+            "frames": args.frames,
+            "screen": [args.width, args.height],
+            "python": sys.version.split()[0],
+            "pygame": pygame.version.ver,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+        },
+        "create_word_list": bench_word_generation(settings, font, args.iterations),
+        "game": {},
+        "scoreboard": bench_scoreboard(screen, settings, font, args.frames, args.seed),
+        "wide_layout": check_wide_layout(settings, font, args.wide_words)
+    }
+    for mode_args in BENCH_MODES:
+        name = ":".join(str(a) for a in mode_args)
+        results["game"][name] = bench_game(screen, settings, font, mode_args, args.keystrokes, args.seed)
+    pygame.quit()
+    return results
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        if key == "meta":
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def print_results(results, baseline=None):
+    current = flatten(results)
+    previous = flatten(baseline) if baseline else {}
+    for name, value in current.items():
+        if not (name.endswith("_us") or name.startswith("alloc") or ".alloc" in name):
+            continue
+        line = f"{name:<60} {value:>12.1f}"
+        if name in previous and previous[name]:
+            change = (value - previous[name]) / previous[name] * 100
+            line += f"  ({change:+.1f}%)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Typemaster benchmarks")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--keystrokes", type=int, default=2000)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--wide-words", type=int, default=300, help="words typed at 3840px to check the word ring")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
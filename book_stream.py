@@ -0,0 +1,82 @@
+import json
+import os
+
+from resources import write_file_atomic
+
+WHITESPACE = b" \t\n\r\x0b\x0c"
+SEPARATORS = [bytes([space]) for space in WHITESPACE]
+MAX_TOKEN_BYTES = 4096
+
+
+def read_words(path, offset=0, chunk_size=65536):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        pending = b""
+        position = offset
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            data = pending + chunk
+            cut = max(data.rfind(space) for space in SEPARATORS) + 1
+            if len(data) - cut > MAX_TOKEN_BYTES:
+                cut = len(data) - 1
+                while cut > 0 and data[cut] & 0xC0 == 0x80:
+                    cut -= 1
+            pending = data[cut:]
+            start = 0
+            for token in data[:cut].split():
+                start = data.index(token, start) + len(token)
+                yield token.decode("utf-8", "replace"), position + start
+            position += cut
+        if pending.strip():
+            yield pending.strip().decode("utf-8", "replace"), position + len(pending)
+
+
+def book_words(path, offset=0, chunk_size=65536):
+    while True:
+        yielded = False
+        for item in read_words(path, offset, chunk_size):
+            yielded = True
+            yield item
+        if not yielded and offset == 0:
+            return
+        offset = 0
+
+
+class BookPositions:
+    def __init__(self, path):
+        self.path = path
+        self.positions = None
+
+    def load(self):
+        if self.positions is None:
+            self.positions = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.positions = json.load(f)
+            except (OSError, ValueError):
+                pass
+        return self.positions
+
+    def get(self, book_path):
+        entry = self.load().get(os.path.abspath(book_path))
+        if not entry:
+            return 0
+        try:
+            size = os.path.getsize(book_path)
+        except OSError:
+            return 0
+        return entry["offset"] if entry.get("size") == size and entry["offset"] < size else 0
+
+    def set(self, book_path, offset):
+        try:
+            size = os.path.getsize(book_path)
+        except OSError:
+            return
+        self.load()[os.path.abspath(book_path)] = {"offset": offset, "size": size}
+
+        def write(temp_path):
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.positions, f, ensure_ascii=False, indent=2)
+        write_file_atomic(self.path, write)
@@ -0,0 +1,88 @@
+import argparse
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from collections.abc import Sequence
+
+CORPUS_MAGIC = b"TMCORPUS"
+CORPUS_VERSION = 1
+CORPUS_EXTENSION = ".tmc"
+HEADER = struct.Struct("<8sIII")
+
+
+class CompiledCorpus(Sequence):
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, charset_size = HEADER.unpack_from(self.data, 0)
+        if magic != CORPUS_MAGIC or version != CORPUS_VERSION:
+            raise ValueError(f"Неверный формат корпуса: {path}")
+        self.count = count
+        offsets_start = HEADER.size
+        offsets_end = offsets_start + 4 * (count + 1)
+        self.offsets = memoryview(self.data)[offsets_start:offsets_end].cast("I")
+        self.charset = self.data[offsets_end:offsets_end + charset_size].decode("utf-8")
+        self.blob_start = offsets_end + charset_size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("corpus index out of range")
+        start = self.blob_start + self.offsets[index]
+        end = self.blob_start + self.offsets[index + 1]
+        return self.data[start:end].decode("utf-8")
+
+
+def compiled_path(path):
+    return os.path.splitext(path)[0] + CORPUS_EXTENSION
+
+
+def build_corpus(source_path, output_path=None):
+    output_path = output_path or compiled_path(source_path)
+    offsets = array("I", [0])
+    charset = set()
+    with tempfile.TemporaryFile() as blob:
+        with open(source_path, "r", encoding="utf-8") as f:
+            for line in f:
+                for word in line.split():
+                    encoded = word.encode("utf-8")
+                    blob.write(encoded)
+                    offsets.append(offsets[-1] + len(encoded))
+                    charset.update(word)
+        charset_bytes = "".join(sorted(charset)).encode("utf-8")
+        temp_path = output_path + ".tmp"
+        with open(temp_path, "wb") as out:
+            out.write(HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, len(offsets) - 1, len(charset_bytes)))
+            offsets.tofile(out)
+            out.write(charset_bytes)
+            blob.seek(0)
+            shutil.copyfileobj(blob, out)
+        os.replace(temp_path, output_path)
+    return output_path, len(offsets) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile word lists into the binary corpus format")
+    parser.add_argument("sources", nargs="+", help="UTF-8 word list files")
+    parser.add_argument("-o", "--output", help="output path (only with a single source)")
+    args = parser.parse_args()
+    if args.output and len(args.sources) > 1:
+        parser.error("--output can only be used with a single source")
+
+    for source in args.sources:
+        output_path, count = build_corpus(source, args.output)
+        print(f"{source} -> {output_path}: {count} слов")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import json
+import time
+
+PHASES = ["events", "update", "draw", "flip", "frame", "interval", "input_latency"]
+
+
+class Histogram:
+    def __init__(self, bucket_us=50, bucket_count=2000):
+        self.bucket_us = bucket_us
+        self.buckets = [0] * (bucket_count + 1)
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def add(self, value_us):
+        index = min(int(value_us // self.bucket_us), len(self.buckets) - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, q):
+        if not self.count:
+            return 0
+        target = q / 100 * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return min((index + 1) * self.bucket_us, self.max_us)
+        return self.max_us
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_us": self.total_us / self.count if self.count else 0,
+            "p50_us": self.percentile(50),
+            "p95_us": self.percentile(95),
+            "p99_us": self.percentile(99),
+            "max_us": self.max_us
+        }
+
+
+class FrameProfiler:
+    def __init__(self, settings):
+        self.settings = settings
+        self.histograms = {phase: Histogram() for phase in PHASES}
+        self.show_overlay = settings.show_perf_overlay
+        self.frame_start = 0
+        self.lap_start = 0
+        self.pending_keys = []
+        self.overlay_surfaces = []
+        self.overlay_refreshed = 0
+        self.first_frame_ms = None
+
+    def start_frame(self, paced=True):
+        now = time.perf_counter_ns()
+        if self.frame_start and paced:
+            self.histograms["interval"].add((now - self.frame_start) / 1000)
+        self.frame_start = now
+        self.lap_start = now
+
+    def lap(self, phase):
+        now = time.perf_counter_ns()
+        self.histograms[phase].add((now - self.lap_start) / 1000)
+        self.lap_start = now
+
+    def key_pressed(self):
+        self.pending_keys.append(time.perf_counter_ns())
+
+    def end_frame(self):
+        now = time.perf_counter_ns()
+        self.histograms["frame"].add((now - self.frame_start) / 1000)
+        for pressed in self.pending_keys:
+            self.histograms["input_latency"].add((now - pressed) / 1000)
+        self.pending_keys.clear()
+
+    def skip_frame(self):
+        self.pending_keys.clear()
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+
+    def draw_overlay(self, screen, font):
+        if not self.show_overlay:
+            return []
+        now = time.perf_counter_ns()
+        if now - self.overlay_refreshed > 500_000_000:
+            self.overlay_refreshed = now
+            self.overlay_surfaces = []
+            for phase in PHASES:
+                summary = self.histograms[phase].summary()
+                line = (f"{phase:<14} p50 {summary['p50_us'] / 1000:6.2f}  p95 {summary['p95_us'] / 1000:6.2f}  "
+                        f"p99 {summary['p99_us'] / 1000:6.2f} ms")
+                self.overlay_surfaces.append(font.render(line, True, self.settings.text_color, (0, 0, 0)))
+        rects = []
+        y = 10
+        for surface in self.overlay_surfaces:
+            rects.append(screen.blit(surface, (10, y)))
+            y += surface.get_height()
+        return rects
+
+    def export(self, path):
+        data = {"time_to_first_frame_ms": self.first_frame_ms}
+        for phase, histogram in self.histograms.items():
+            data[phase] = dict(histogram.summary(), bucket_us=histogram.bucket_us,
+                               buckets={str(i * histogram.bucket_us): n
+                                        for i, n in enumerate(histogram.buckets) if n})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
@@ -1,7 +1,238 @@
+import itertools
+import os
+import queue
 import random
+import threading
 import time
 
-from resources import load_wordlist, load_quote_list
+from adaptive import ProfileWriter, WeaknessProfile, get_char_index
+from recording import SessionRecorder
+from book_stream import BookPositions, book_words
+from key_analytics import KeyLog, analyze
+from language_packs import get_language_registry
+from live_stats import LiveStats
+from quote_store import get_quote_store
+from resources import get_wordlist
+from results_store import parameter_key
+from sampling import get_sampler, spread_repeats
+
+
+def sample_indices(size, count, rng=random):
+    if count >= size:
+        indices = list(range(size))
+        rng.shuffle(indices)
+        return indices
+    seen = set()
+    indices = []
+    while len(indices) < count:
+        index = rng.randrange(size)
+        if index not in seen:
+            seen.add(index)
+            indices.append(index)
+    return indices
+
+
+def split_counts(count, numbers_enabled, punctuation_enabled):
+    if numbers_enabled and punctuation_enabled:
+        num_special_total = (5 * count) // 10
+        num_numbers = num_special_total // 2
+        num_punctuation = num_special_total - num_numbers
+    elif numbers_enabled:
+        num_numbers = (2 * count) // 5
+        num_punctuation = 0
+    elif punctuation_enabled:
+        num_numbers = 0
+        num_punctuation = (2 * count) // 5
+    else:
+        num_numbers = 0
+        num_punctuation = 0
+    return count - num_numbers - num_punctuation, num_numbers, num_punctuation
+
+
+class WordGenerator:
+    def __init__(self, settings, batch_size=50, wordlist_path=None):
+        self.settings = settings
+        self.batch_size = batch_size
+        self.wordlist_path = wordlist_path or settings.wordlist_path
+        self.seed = random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.batch(self.batch_size)
+
+    def get_pools(self, key):
+        numbers_enabled, punctuation_enabled = key
+        return (
+            get_wordlist(self.wordlist_path),
+            get_wordlist(self.settings.numbers_path) if numbers_enabled else [],
+            get_wordlist(self.settings.punctuation_path) if punctuation_enabled else []
+        )
+
+    def current_key(self):
+        return self.settings.numbers_enabled, self.settings.punctuation_enabled
+
+    def weighted(self):
+        return self.settings.word_sampling != "uniform" or self.settings.sampling_top_n > 0
+
+    def sample_words(self, pool, count):
+        if not self.weighted() or not pool:
+            return [pool[i] for i in sample_indices(len(pool), min(len(pool), count), self.rng)]
+        sampler = get_sampler(len(pool), self.settings.word_sampling, self.settings.zipf_exponent,
+                              self.settings.sampling_top_n)
+        return [pool[i] for i in sampler.sample(count, self.rng)]
+
+    def batch(self, count):
+        key = self.current_key()
+        pools = self.get_pools(key)
+        words_count, numbers_count, punctuation_count = split_counts(count, *key)
+        full_list = self.sample_words(pools[0], words_count)
+        for pool, pool_count in zip(pools[1:], (numbers_count, punctuation_count)):
+            full_list.extend(pool[i] for i in sample_indices(len(pool), min(len(pool), pool_count), self.rng))
+        self.rng.shuffle(full_list)
+        if self.weighted():
+            spread_repeats(full_list, self.rng)
+        return full_list
+
+
+class AdaptiveWordGenerator(WordGenerator):
+    def __init__(self, settings, profile, batch_size=50):
+        super().__init__(settings, batch_size, settings.adaptive_wordlist_path)
+        self.profile = profile
+        self.targets = []
+
+    def refresh_targets(self):
+        self.targets = self.profile.targets(self.settings.adaptive_targets)
+
+    def sample_words(self, pool, count):
+        if not pool:
+            return []
+        index = get_char_index(self.wordlist_path, pool)
+        targets = [(index.word_ids(key), weight) for key, weight in self.targets if index.word_ids(key)]
+        if not targets:
+            return super().sample_words(pool, count)
+        postings = [ids for ids, _ in targets]
+        weights = [weight for _, weight in targets]
+        base = super().sample_words(pool, count)
+        words = []
+        for i in range(count):
+            if self.rng.random() < self.settings.adaptive_focus:
+                ids = self.rng.choices(postings, weights)[0]
+                word = pool[ids[self.rng.randrange(len(ids))]]
+            else:
+                word = base[i % len(base)]
+            if words and word == words[-1]:
+                word = base[i % len(base)]
+            words.append(word)
+        return words
+
+
+class WordPrefetcher:
+    def __init__(self, generator, depth=2, first_count=None):
+        self.generator = generator
+        self.first_count = first_count or generator.batch_size
+        self.ready = queue.Queue(maxsize=depth)
+        self.stopped = None
+        self.thread = None
+
+    def start(self, generation=0):
+        if self.thread is None:
+            self.stopped = threading.Event()
+            self.thread = threading.Thread(target=self.run, args=(self.stopped, generation), daemon=True)
+            self.thread.start()
+
+    def run(self, stopped, generation):
+        try:
+            self.generator.rng.seed(self.generator.seed + generation)
+            count = self.first_count
+            while not stopped.is_set():
+                key = self.generator.current_key()
+                batch = self.generator.batch(count)
+                count = self.generator.batch_size
+                self.ready.put((key, batch))
+        except Exception as e:
+            self.ready.put((None, e))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.thread is None:
+            return next(self.generator)
+        key = self.generator.current_key()
+        while True:
+            batch_key, batch = self.ready.get()
+            if batch_key is None:
+                self.thread = None
+                raise batch
+            if batch_key == key:
+                return batch
+
+    def drain(self):
+        while True:
+            try:
+                self.ready.get_nowait()
+            except queue.Empty:
+                break
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopped.set()
+        while self.thread.is_alive():
+            self.drain()
+            self.thread.join(0.01)
+        self.drain()
+        self.thread = None
+
+
+class WordStream:
+    def __init__(self, capacity, items=()):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.base = 0
+        self.end = 0
+        self.floor = None
+        self.extend(items)
+
+    def __len__(self):
+        return self.end
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.end
+        if not self.base <= index < self.end:
+            raise IndexError("word stream index out of range")
+        return self.slots[index % self.capacity]
+
+    def __iter__(self):
+        for index in range(self.base, self.end):
+            yield self.slots[index % self.capacity]
+
+    def protect(self, index):
+        self.floor = index
+
+    def grow(self):
+        items = list(self)
+        self.capacity *= 2
+        self.slots = [None] * self.capacity
+        for index, item in enumerate(items, self.base):
+            self.slots[index % self.capacity] = item
+
+    def append(self, item):
+        if self.end - self.base >= self.capacity:
+            if self.floor is not None and self.base >= self.floor:
+                self.grow()
+            else:
+                self.base += 1
+        self.slots[self.end % self.capacity] = item
+        self.end += 1
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
 
 
 class GameMode:
@@ -9,6 +240,7 @@ class GameMode:
         self.settings = settings
         self.font = font
         self.words = []
+        self.generation = 0
         self.current_word_index = 0
         self.current_char_index = 0
         self.start_time = 0
@@ -20,6 +252,13 @@ class GameMode:
         self.finished = False
         self.user_input = ""
         self.finished_word_results = []
+        self.word_generator = WordGenerator(settings)
+        self.live_stats = LiveStats(settings.live_stats_window)
+        self.key_log = KeyLog()
+        self.prefetcher = None
+        self.clock = time.time
+        self.recorder = None
+        self.word_feed = None
 
     def start(self):
         self.current_word_index = 0
@@ -33,14 +272,50 @@ class GameMode:
         self.start_time = 0
         self.user_input = ""
         self.finished_word_results = []
-        self.generate_words()
+        self.live_stats.reset()
+        self.key_log.reset()
+        self.generation += 1
+        if self.word_feed is not None:
+            self.load_recorded_words(next(self.word_feed))
+        else:
+            if self.prefetcher:
+                self.prefetcher.stop()
+                self.prefetcher.start(self.generation)
+            self.generate_words()
+        if self.recorder:
+            self.recorder.record_words(self.words)
+
+    def stop(self):
+        if self.prefetcher:
+            self.prefetcher.stop()
 
     def generate_words(self):
         pass
 
+    def load_recorded_words(self, words):
+        self.words = words
+
+    def create_word_list(self, count):
+        return self.word_generator.batch(count)
+
+    def next_batch(self):
+        if self.word_feed is not None:
+            return next(self.word_feed, [])
+        return self.more_words()
+
+    def more_words(self):
+        return []
+
+    def extend_words(self, words):
+        self.words.extend(words)
+        if self.recorder:
+            self.recorder.record_words(words)
+
     def handle_input(self, char):
         if self.finished:
             return
+        if self.recorder:
+            self.recorder.record_key(char)
         if char in (" ", "\r"):
             if self.user_input == "":
                 return
@@ -53,6 +328,9 @@ class GameMode:
                     missing = len(current_word) - len(self.user_input)
                     self.errors += missing
                     self.total_chars += missing
+            now = self.clock()
+            self.live_stats.word_end(now, len(self.user_input) + 1)
+            self.key_log.record(now, " ", True)
             self.current_word_index += 1
             self.user_input = ""
             self.current_char_index = 0
@@ -61,19 +339,23 @@ class GameMode:
             return
         self.user_input += char
         if len(self.user_input) == 1 and self.start_time == 0:
-            self.start_time = time.time()
+            self.start_time = self.clock()
         self.total_chars += 1
         current_word = self.words[self.current_word_index]
-        if self.current_char_index < len(current_word):
-            if char == current_word[self.current_char_index]:
-                self.correct_chars += 1
-            else:
-                self.errors += 1
+        expected = current_word[self.current_char_index] if self.current_char_index < len(current_word) else ""
+        correct = bool(expected) and char == expected
+        if correct:
+            self.correct_chars += 1
         else:
             self.errors += 1
+        now = self.clock()
+        self.live_stats.key(now, correct)
+        self.key_log.record(now, expected, correct)
         self.current_char_index += 1
 
     def handle_backspace(self):
+        if self.recorder:
+            self.recorder.record_backspace()
         if self.user_input:
             last_index = len(self.user_input) - 1
             last_char = self.user_input[last_index]
@@ -81,23 +363,33 @@ class GameMode:
             self.user_input = self.user_input[:-1]
             self.current_char_index -= 1
             self.total_chars -= 1
+            was_correct = False
             if self.current_char_index < len(current_word):
-                if last_char == current_word[self.current_char_index]:
+                was_correct = last_char == current_word[self.current_char_index]
+                if was_correct:
                     self.correct_chars -= 1
                 else:
                     self.errors -= 1
+            now = self.clock()
+            self.live_stats.backspace(now, was_correct)
+            self.key_log.record_backspace(now)
 
     def update_time(self):
         if not self.finished:
             if self.start_time != 0:
-                self.time_elapsed = time.time() - self.start_time
+                now = self.clock()
+                self.time_elapsed = now - self.start_time
+                self.live_stats.sample(now)
             else:
                 self.time_elapsed = 0
 
     def finish(self):
         self.finished = True
-        self.end_time = time.time()
+        self.end_time = self.clock()
         self.time_elapsed = self.end_time - self.start_time
+        self.live_stats.sample(self.end_time)
+        if self.recorder:
+            self.recorder.record_finish()
 
     def get_stats(self):
         time_in_minutes = self.time_elapsed / 60.0 if self.time_elapsed else 1
@@ -115,65 +407,49 @@ class GameMode:
         self.start()
 
 
-class TimeMode(GameMode):
-    def __init__(self, settings, font, time_limit=60):
+class StreamingMode(GameMode):
+    def __init__(self, settings, font, time_limit=0):
         super().__init__(settings, font)
         self.time_limit = time_limit
         self.words_to_add = 50
         self.max_display_words = 100
 
-    def generate_words(self):
-        self.words = self.create_word_list(self.words_to_add)
+    def set_words(self, words):
+        self.words = WordStream(self.max_display_words, words)
+        self.finished_word_results = WordStream(self.max_display_words)
 
-    def add_more_words(self):
-        new_words = self.create_word_list(self.words_to_add)
-        self.words += new_words
-        if len(self.words) > self.max_display_words:
-            self.words = self.words[-self.max_display_words:]
+    def load_recorded_words(self, words):
+        self.set_words(words)
 
-    def create_word_list(self, count):
-        wordlist = load_wordlist(self.settings.wordlist_path)
-        numbers_list = load_wordlist(self.settings.numbers_path) if self.settings.numbers_enabled else []
-        punctuation_list = load_wordlist(self.settings.punctuation_path) if self.settings.punctuation_enabled else []
-
-        if self.settings.numbers_enabled and self.settings.punctuation_enabled:
-            num_special_total = (5 * count) // 10
-            num_numbers = num_special_total // 2
-            num_punctuation = num_special_total - num_numbers
-            num_words = count - num_numbers - num_punctuation
-        elif self.settings.numbers_enabled:
-            num_numbers = (2 * count) // 5
-            num_punctuation = 0
-            num_words = count - num_numbers
-        elif self.settings.punctuation_enabled:
-            num_punctuation = (2 * count) // 5
-            num_numbers = 0
-            num_words = count - num_punctuation
-        else:
-            num_words = count
-            num_numbers = 0
-            num_punctuation = 0
-
-        selected_words = random.sample(wordlist, min(len(wordlist), num_words))
-        selected_numbers = random.sample(numbers_list, min(len(numbers_list), num_numbers)) if numbers_list else []
-        selected_punctuation = random.sample(punctuation_list,
-                                             min(len(punctuation_list), num_punctuation)) if punctuation_list else []
+    def more_words(self):
+        return next(self.prefetcher)
 
-        full_list = selected_words + selected_numbers + selected_punctuation
-        random.shuffle(full_list)
-        return full_list
+    def add_more_words(self):
+        words = self.next_batch()
+        if words:
+            self.extend_words(words)
 
     def handle_input(self, char):
         super().handle_input(char)
-        if len(self.words) - self.current_word_index < 10:
+        if self.time_limit > 0 and len(self.words) - self.current_word_index < 10:
             self.add_more_words()
 
     def update_time(self):
         super().update_time()
-        if self.time_elapsed >= self.time_limit and not self.finished:
+        if 0 < self.time_limit <= self.time_elapsed and not self.finished:
             self.finish()
 
 
+class TimeMode(StreamingMode):
+    def __init__(self, settings, font, time_limit=60):
+        super().__init__(settings, font, time_limit)
+        self.word_generator.batch_size = self.words_to_add
+        self.prefetcher = WordPrefetcher(self.word_generator, settings.prefetch_batches)
+
+    def generate_words(self):
+        self.set_words(next(self.prefetcher))
+
+
 class WordsMode(GameMode):
     def __init__(self, settings, font, word_count=25):
         super().__init__(settings, font)
@@ -182,44 +458,12 @@ class WordsMode(GameMode):
     def generate_words(self):
         self.words = self.create_word_list(self.word_count)
 
-    def create_word_list(self, count):
-        wordlist = load_wordlist(self.settings.wordlist_path)
-        numbers_list = load_wordlist(self.settings.numbers_path) if self.settings.numbers_enabled else []
-        punctuation_list = load_wordlist(self.settings.punctuation_path) if self.settings.punctuation_enabled else []
-
-        if self.settings.numbers_enabled and self.settings.punctuation_enabled:
-            num_special_total = (5 * count) // 10
-            num_numbers = num_special_total // 2
-            num_punctuation = num_special_total - num_numbers
-            num_words = count - num_numbers - num_punctuation
-        elif self.settings.numbers_enabled:
-            num_numbers = (2 * count) // 5
-            num_punctuation = 0
-            num_words = count - num_numbers
-        elif self.settings.punctuation_enabled:
-            num_punctuation = (2 * count) // 5
-            num_numbers = 0
-            num_words = count - num_punctuation
-        else:
-            num_words = count
-            num_numbers = 0
-            num_punctuation = 0
-
-        selected_words = random.sample(wordlist, min(len(wordlist), num_words))
-        selected_numbers = random.sample(numbers_list, min(len(numbers_list), num_numbers)) if numbers_list else []
-        selected_punctuation = random.sample(punctuation_list,
-                                             min(len(punctuation_list), num_punctuation)) if punctuation_list else []
-
-        full_list = selected_words + selected_numbers + selected_punctuation
-        random.shuffle(full_list)
-        return full_list
-
 
 class QuoteMode(GameMode):
     def generate_words(self):
-        quote_list = load_quote_list(self.settings.quote_source)
-        if quote_list:
-            quote = random.choice(quote_list)
+        quote_store = get_quote_store(self.settings.quote_source)
+        quote = quote_store.random_quote(self.settings.quote_length) if quote_store else None
+        if quote:
             self.words = quote.split()
         else:
             self.words = ["No", "quotes", "found"]
@@ -229,120 +473,131 @@ class ZenMode(GameMode):
     def generate_words(self):
         self.words = self.create_word_list(self.settings.max_zen_words)
 
-    def create_word_list(self, count):
-        wordlist = load_wordlist(self.settings.wordlist_path)
-        numbers_list = load_wordlist(self.settings.numbers_path) if self.settings.numbers_enabled else []
-        punctuation_list = load_wordlist(self.settings.punctuation_path) if self.settings.punctuation_enabled else []
-
-        if self.settings.numbers_enabled and self.settings.punctuation_enabled:
-            num_special_total = (5 * count) // 10
-            num_numbers = num_special_total // 2
-            num_punctuation = num_special_total - num_numbers
-            num_words = count - num_numbers - num_punctuation
-        elif self.settings.numbers_enabled:
-            num_numbers = (2 * count) // 5
-            num_punctuation = 0
-            num_words = count - num_numbers
-        elif self.settings.punctuation_enabled:
-            num_punctuation = (2 * count) // 5
-            num_numbers = 0
-            num_words = count - num_punctuation
-        else:
-            num_words = count
-            num_numbers = 0
-            num_punctuation = 0
-
-        selected_words = random.sample(wordlist, min(len(wordlist), num_words))
-        selected_numbers = random.sample(numbers_list, min(len(numbers_list), num_numbers)) if numbers_list else []
-        selected_punctuation = random.sample(punctuation_list,
-                                             min(len(punctuation_list), num_punctuation)) if punctuation_list else []
-
-        full_list = selected_words + selected_numbers + selected_punctuation
-        random.shuffle(full_list)
-        return full_list
-
 
 class LanguageMode(GameMode):
+    def __init__(self, settings, font, language=None):
+        super().__init__(settings, font)
+        self.pack = get_language_registry(settings).select(language)
+
     def generate_words(self):
-        full_lang = load_wordlist(self.settings.languages_path)
-        random.shuffle(full_lang)
-        self.words = full_lang[:25]
+        full_lang = self.pack.words()
+        if self.word_generator.weighted():
+            self.words = self.word_generator.sample_words(full_lang, 25)
+            return
+        self.words = [full_lang[i] for i in sample_indices(len(full_lang), min(len(full_lang), 25),
+                                                           self.word_generator.rng)]
 
 
-class CustomMode(GameMode):
+class CustomMode(StreamingMode):
     def __init__(self, settings, font, time_limit=0, word_count=0):
-        super().__init__(settings, font)
-        self.time_limit = time_limit
+        super().__init__(settings, font, time_limit)
         self.word_count = word_count
         self.words_to_add = 50 if time_limit > 0 else 0
-        self.max_display_words = 100 if time_limit > 0 else word_count
+        self.max_display_words = max(100, word_count + self.words_to_add) if time_limit > 0 else word_count
+        self.word_generator.batch_size = self.words_to_add
+        if time_limit > 0:
+            self.prefetcher = WordPrefetcher(self.word_generator, settings.prefetch_batches, word_count)
+
+    def set_words(self, words):
+        if self.time_limit > 0:
+            super().set_words(words)
+        else:
+            self.words = words
 
     def generate_words(self):
-        if self.word_count > 0:
-            self.words = self.create_word_list(self.word_count)
-        else:
-            self.words = self.create_word_list(self.words_to_add)
+        self.set_words(next(self.prefetcher) if self.time_limit > 0 else self.create_word_list(self.word_count))
 
-    def add_more_words(self):
-        new_words = self.create_word_list(self.words_to_add)
-        self.words += new_words
-        if len(self.words) > self.max_display_words:
-            self.words = self.words[-self.max_display_words:]
 
-    def create_word_list(self, count):
-        wordlist = load_wordlist(self.settings.wordlist_path)
-        numbers_list = load_wordlist(self.settings.numbers_path) if self.settings.numbers_enabled else []
-        punctuation_list = load_wordlist(self.settings.punctuation_path) if self.settings.punctuation_enabled else []
-
-        if self.settings.numbers_enabled and self.settings.punctuation_enabled:
-            num_special_total = (5 * count) // 10
-            num_numbers = num_special_total // 2
-            num_punctuation = num_special_total - num_numbers
-            num_words = count - num_numbers - num_punctuation
-        elif self.settings.numbers_enabled:
-            num_numbers = (2 * count) // 5
-            num_punctuation = 0
-            num_words = count - num_numbers
-        elif self.settings.punctuation_enabled:
-            num_punctuation = (2 * count) // 5
-            num_numbers = 0
-            num_words = count - num_punctuation
-        else:
-            num_words = count
-            num_numbers = 0
-            num_punctuation = 0
+class BookMode(StreamingMode):
+    def __init__(self, settings, font, book_path, time_limit=0):
+        super().__init__(settings, font, time_limit)
+        self.book_path = book_path
+        self.max_display_words = 100 if time_limit > 0 else max(100, settings.book_page_words)
+        self.positions = BookPositions(settings.book_positions_path)
+        self.reader = None
+        self.word_offsets = WordStream(self.max_display_words)
 
-        selected_words = random.sample(wordlist, min(len(wordlist), num_words))
-        selected_numbers = random.sample(numbers_list, min(len(numbers_list), num_numbers)) if numbers_list else []
-        selected_punctuation = random.sample(punctuation_list,
-                                             min(len(punctuation_list), num_punctuation)) if punctuation_list else []
+    def start(self):
+        self.save_position()
+        super().start()
 
-        full_list = selected_words + selected_numbers + selected_punctuation
-        random.shuffle(full_list)
-        return full_list
+    def generate_words(self):
+        self.close_reader()
+        self.word_offsets = WordStream(self.max_display_words)
+        if not os.path.exists(self.book_path):
+            print(f"Не удалось найти книгу: {self.book_path}")
+            self.set_words(["No", "book", "found"])
+            return
+        self.reader = book_words(self.book_path, self.positions.get(self.book_path))
+        count = self.words_to_add if self.time_limit > 0 else self.settings.book_page_words
+        self.set_words(self.read_words(count) or ["No", "book", "found"])
+
+    def load_recorded_words(self, words):
+        self.close_reader()
+        self.word_offsets = WordStream(self.max_display_words)
+        self.set_words(words)
+
+    def read_words(self, count):
+        words = []
+        for word, offset in itertools.islice(self.reader, count):
+            words.append(word)
+            self.word_offsets.append(offset)
+        return words
+
+    def close_reader(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def save_position(self):
+        if self.word_feed is None and self.current_word_index and self.current_word_index <= len(self.word_offsets):
+            self.positions.set(self.book_path, self.word_offsets[self.current_word_index - 1])
+
+    def more_words(self):
+        return self.read_words(self.words_to_add) if self.reader is not None else []
 
-    def handle_input(self, char):
-        super().handle_input(char)
-        if self.time_limit > 0 and len(self.words) - self.current_word_index < 10:
-            self.add_more_words()
+    def finish(self):
+        super().finish()
+        self.save_position()
 
-    def update_time(self):
-        super().update_time()
-        if 0 < self.time_limit <= self.time_elapsed and not self.finished:
-            self.finish()
+    def stop(self):
+        super().stop()
+        self.save_position()
+        self.close_reader()
+
+
+class AdaptiveMode(GameMode):
+    def __init__(self, settings, font, profile, word_count=50):
+        super().__init__(settings, font)
+        self.word_count = word_count
+        self.word_generator = AdaptiveWordGenerator(settings, profile)
+
+    def generate_words(self):
+        self.word_generator.refresh_targets()
+        self.words = self.create_word_list(self.word_count)
 
 
 class GameManager:
-    def __init__(self, settings, font):
+    def __init__(self, settings, font, mode=None, clock=time.time, word_feed=None, results=None):
         self.settings = settings
         self.font = font
+        self.results = results
+        self.result_history = None
         self.current_mode = None
         self.session_finished = False
-        self.selected_mode_name = "time"
-        self.selected_mode = TimeMode(self.settings, self.font, self.settings.default_time_mode)
-        self.selected_mode.start()
+        self.clock = clock
+        self.word_feed = word_feed
+        self.recorder = None
+        self.weakness_profile = None
+        self.profile_writer = None
+        self.analytics = None
+        self.selected_mode = None
+        self.selected_mode_name = None
+        self.selected_mode_parameters = (None, None)
+        self.set_mode(*(mode or ("time", self.settings.default_time_mode)))
 
     def set_mode(self, mode_name, parameter=None, parameter2=None):
+        previous_mode = self.selected_mode
         if mode_name == "time":
             time_limit = parameter if parameter else self.settings.default_time_mode
             self.selected_mode = TimeMode(self.settings, self.font, time_limit)
@@ -354,24 +609,82 @@ class GameManager:
         elif mode_name == "zen":
             self.selected_mode = ZenMode(self.settings, self.font)
         elif mode_name == "language":
-            self.selected_mode = LanguageMode(self.settings, self.font)
+            self.selected_mode = LanguageMode(self.settings, self.font, parameter)
         elif mode_name == "custom":
             time_limit = parameter if parameter else 0
             word_count = parameter2 if parameter2 else 0
             self.selected_mode = CustomMode(self.settings, self.font, time_limit, word_count)
+        elif mode_name == "adaptive":
+            word_count = parameter if parameter else self.settings.default_words_mode
+            self.selected_mode = AdaptiveMode(self.settings, self.font, self.get_weakness_profile(), word_count)
+        elif mode_name == "book":
+            time_limit = parameter2 if parameter2 else 0
+            self.selected_mode = BookMode(self.settings, self.font, parameter, time_limit)
         else:
             print(f"Режим {mode_name} не найден.")
             return
 
+        if previous_mode:
+            previous_mode.stop()
         self.selected_mode_name = mode_name
+        self.selected_mode_parameters = (parameter, parameter2)
+        self.attach_session()
         self.selected_mode.start()
         self.session_finished = False
+        self.analytics = None
+        self.result_history = None
+
+    def get_weakness_profile(self):
+        if self.weakness_profile is None or self.weakness_profile.user != self.settings.user_name:
+            if self.profile_writer is None and self.word_feed is None:
+                self.profile_writer = ProfileWriter()
+            self.weakness_profile = WeaknessProfile(self.settings.key_profile_path, self.settings.user_name,
+                                                    self.profile_writer)
+        return self.weakness_profile
+
+    def attach_session(self):
+        self.recorder = None
+        if self.settings.record_sessions:
+            self.recorder = SessionRecorder({
+                "user": self.settings.user_name,
+                "mode": self.selected_mode_name,
+                "parameters": list(self.selected_mode_parameters),
+                "numbers": self.settings.numbers_enabled,
+                "punctuation": self.settings.punctuation_enabled,
+                "created": time.strftime("%Y-%m-%d %H:%M:%S")
+            })
+        self.selected_mode.clock = self.clock
+        self.selected_mode.word_feed = self.word_feed
+        self.selected_mode.recorder = self.recorder
+
+    def save_recording(self):
+        if not self.recorder:
+            return
+        os.makedirs(self.settings.recordings_dir, exist_ok=True)
+        user = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.settings.user_name)
+        filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{user}-{self.selected_mode_name}-{time.monotonic_ns()}.tmlog"
+        self.recorder.save(os.path.join(self.settings.recordings_dir, filename))
+        self.recorder = None
+
+    def save_result(self):
+        if not self.results or self.word_feed is not None:
+            return
+        stats = self.get_stats()
+        parameter = parameter_key(self.selected_mode_parameters)
+        self.result_history = self.results.history(self.settings.user_name, self.selected_mode_name, parameter,
+                                                   stats["wpm"], self.settings.results_rolling_window)
+        self.results.add(self.settings.user_name, self.selected_mode_name, parameter, stats)
 
     def update(self):
         if self.selected_mode:
             self.selected_mode.update_time()
-            if self.selected_mode.finished:
+            if self.selected_mode.finished and not self.session_finished:
                 self.session_finished = True
+                self.save_recording()
+                self.save_result()
+                self.analytics = analyze(self.selected_mode.key_log)
+                if self.word_feed is None and self.settings.key_profile_path:
+                    self.get_weakness_profile().update(self.analytics)
 
     def handle_input(self, char):
         if self.selected_mode and not self.selected_mode.finished:
@@ -388,5 +701,15 @@ class GameManager:
 
     def restart_session(self):
         if self.selected_mode:
+            self.attach_session()
             self.selected_mode.start()
             self.session_finished = False
+            self.analytics = None
+            self.result_history = None
+
+    def close(self):
+        if self.selected_mode:
+            self.selected_mode.stop()
+        if self.profile_writer:
+            self.profile_writer.close()
+            self.profile_writer = None
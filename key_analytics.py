@@ -0,0 +1,150 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BACKSPACE = 8
+SPACE = 32
+
+
+class KeyLog:
+    def __init__(self):
+        self.times = array("d")
+        self.expected = array("I")
+        self.correct = array("b")
+
+    def reset(self):
+        del self.times[:]
+        del self.expected[:]
+        del self.correct[:]
+
+    def record(self, now, expected, correct):
+        self.times.append(now)
+        self.expected.append(ord(expected) if expected else 0)
+        self.correct.append(1 if correct else 0)
+
+    def record_backspace(self, now):
+        self.record(now, "\b", True)
+
+    def __len__(self):
+        return len(self.times)
+
+
+def percentile(values, q):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def percentile_sorted(values, q):
+    if not values:
+        return 0
+    index = min(len(values) - 1, int(q / 100 * len(values)))
+    return values[index]
+
+
+def analyze(log, min_count=2, top=5):
+    if len(log) < 2:
+        return None
+    if np is not None:
+        return analyze_numpy(log, min_count, top)
+    return analyze_python(log, min_count, top)
+
+
+def analyze_numpy(log, min_count, top):
+    times = np.frombuffer(log.times, dtype=np.float64)
+    expected = np.frombuffer(log.expected, dtype=np.uint32)
+    correct = np.frombuffer(log.correct, dtype=np.int8).astype(bool)
+    latency = np.diff(times) * 1000
+    current = expected[1:]
+    previous = expected[:-1]
+    valid = (current != BACKSPACE) & (previous != BACKSPACE) & (current != 0)
+
+    keys, inverse = np.unique(current[valid], return_inverse=True)
+    key_latency = latency[valid]
+    order = np.lexsort((key_latency, inverse))
+    counts = np.bincount(inverse, minlength=len(keys))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sorted_latency = key_latency[order]
+    means = np.bincount(inverse, weights=key_latency, minlength=len(keys)) / np.maximum(counts, 1)
+    per_key = {}
+    for i, code in enumerate(keys):
+        if code == SPACE or counts[i] < min_count:
+            continue
+        group = sorted_latency[starts[i]:starts[i] + counts[i]]
+        per_key[chr(code)] = {"count": int(counts[i]), "mean_ms": float(means[i]),
+                              "p50_ms": float(group[int(0.5 * len(group))]),
+                              "p90_ms": float(group[min(len(group) - 1, int(0.9 * len(group)))])}
+
+    pair_mask = valid & correct[1:] & correct[:-1] & (previous != 0)
+    pairs = previous[pair_mask].astype(np.uint64) << np.uint64(32) | current[pair_mask].astype(np.uint64)
+    pair_keys, pair_inverse = np.unique(pairs, return_inverse=True)
+    pair_counts = np.bincount(pair_inverse, minlength=len(pair_keys))
+    pair_means = np.bincount(pair_inverse, weights=latency[pair_mask], minlength=len(pair_keys)) / np.maximum(
+        pair_counts, 1)
+    bigrams = {}
+    for i, pair in enumerate(pair_keys):
+        first, second = int(pair) >> 32, int(pair) & 0xFFFFFFFF
+        if pair_counts[i] >= min_count and SPACE not in (first, second):
+            bigrams[chr(first) + chr(second)] = {"count": int(pair_counts[i]), "mean_ms": float(pair_means[i])}
+
+    typed = (expected != BACKSPACE) & (expected != SPACE) & (expected != 0)
+    error_keys, error_inverse = np.unique(expected[typed], return_inverse=True)
+    totals = np.bincount(error_inverse, minlength=len(error_keys))
+    misses = np.bincount(error_inverse, weights=(~correct[typed]).astype(np.float64),
+                         minlength=len(error_keys))
+    errors = {chr(code): {"count": int(totals[i]), "errors": int(misses[i]), "rate": float(misses[i] / totals[i])}
+              for i, code in enumerate(error_keys)}
+    return summarize(per_key, bigrams, errors, top)
+
+
+def analyze_python(log, min_count, top):
+    times, expected, correct = log.times, log.expected, log.correct
+    key_latencies = {}
+    pair_latencies = {}
+    for i in range(1, len(times)):
+        current, previous = expected[i], expected[i - 1]
+        if current in (BACKSPACE, 0) or previous == BACKSPACE:
+            continue
+        latency = (times[i] - times[i - 1]) * 1000
+        key_latencies.setdefault(current, []).append(latency)
+        if correct[i] and correct[i - 1] and previous != 0:
+            pair_latencies.setdefault((previous, current), []).append(latency)
+
+    per_key = {}
+    for code, values in key_latencies.items():
+        if code == SPACE or len(values) < min_count:
+            continue
+        values.sort()
+        per_key[chr(code)] = {"count": len(values), "mean_ms": sum(values) / len(values),
+                              "p50_ms": percentile_sorted(values, 50), "p90_ms": percentile_sorted(values, 90)}
+
+    bigrams = {}
+    for (first, second), values in pair_latencies.items():
+        if len(values) >= min_count and SPACE not in (first, second):
+            bigrams[chr(first) + chr(second)] = {"count": len(values), "mean_ms": sum(values) / len(values)}
+
+    totals = {}
+    for code, ok in zip(expected, correct):
+        if code in (BACKSPACE, SPACE, 0):
+            continue
+        entry = totals.setdefault(code, [0, 0])
+        entry[0] += 1
+        entry[1] += 0 if ok else 1
+    errors = {chr(code): {"count": count, "errors": misses, "rate": misses / count}
+              for code, (count, misses) in totals.items()}
+    return summarize(per_key, bigrams, errors, top)
+
+
+def summarize(per_key, bigrams, errors, top):
+    return {
+        "keys": per_key,
+        "bigrams": bigrams,
+        "errors": errors,
+        "slowest_keys": sorted(per_key, key=lambda char: per_key[char]["mean_ms"], reverse=True)[:top],
+        "slowest_bigrams": sorted(bigrams, key=lambda pair: bigrams[pair]["mean_ms"], reverse=True)[:top]
+    }
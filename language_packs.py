@@ -0,0 +1,54 @@
+import json
+
+from resources import evict_cached, get_wordlist
+
+
+class LanguagePack:
+    def __init__(self, pack_id, name, path):
+        self.id = pack_id
+        self.name = name
+        self.path = path
+
+    def words(self):
+        return get_wordlist(self.path)
+
+
+class LanguageRegistry:
+    def __init__(self, settings):
+        self.settings = settings
+        self.packs = {}
+        self.loaded = None
+        try:
+            with open(settings.languages_manifest, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Не удалось загрузить список языков {settings.languages_manifest}: {e}")
+            manifest = {}
+        for pack_id, meta in manifest.items():
+            self.packs[pack_id] = LanguagePack(pack_id, meta.get("name", pack_id), meta["path"])
+        if not self.packs:
+            self.packs["default"] = LanguagePack("default", "default", settings.languages_path)
+
+    def get(self, pack_id=None):
+        return self.packs.get(pack_id or self.settings.language) or next(iter(self.packs.values()))
+
+    def select(self, pack_id=None):
+        pack = self.get(pack_id)
+        if self.loaded and self.loaded is not pack and self.loaded.path not in self.shared_paths():
+            evict_cached(self.loaded.path)
+        self.loaded = pack
+        self.settings.language = pack.id
+        return pack
+
+    def shared_paths(self):
+        return (self.settings.wordlist_path, self.settings.numbers_path, self.settings.punctuation_path)
+
+
+_registry = None
+
+
+def get_language_registry(settings):
+    global _registry
+    if _registry is None or _registry.settings is not settings:
+        _registry = LanguageRegistry(settings)
+    return _registry
@@ -0,0 +1,119 @@
+from array import array
+from collections import deque
+
+
+class LiveStats:
+    def __init__(self, window=5.0, resolution=0.25, history_size=600):
+        self.window = window
+        self.resolution = resolution
+        self.size = max(1, int(round(window / resolution)))
+        self.typed = array("i", [0]) * self.size
+        self.correct = array("i", [0]) * self.size
+        self.errors = array("i", [0]) * self.size
+        self.history = deque(maxlen=history_size)
+        self.reset()
+
+    def reset(self):
+        for buckets in (self.typed, self.correct, self.errors):
+            for i in range(self.size):
+                buckets[i] = 0
+        self.typed_sum = 0
+        self.correct_sum = 0
+        self.errors_sum = 0
+        self.start = None
+        self.bucket = 0
+        self.sampled = 0
+        self.now = 0
+        self.word_start = None
+        self.burst = 0
+        self.best_burst = 0
+        self.history.clear()
+
+    def advance(self, now):
+        if self.start is None:
+            self.start = now
+        bucket = int((now - self.start) / self.resolution)
+        if bucket > self.bucket:
+            for b in range(self.bucket + 1, min(bucket, self.bucket + self.size) + 1):
+                i = b % self.size
+                self.typed_sum -= self.typed[i]
+                self.correct_sum -= self.correct[i]
+                self.errors_sum -= self.errors[i]
+                self.typed[i] = self.correct[i] = self.errors[i] = 0
+            self.bucket = bucket
+        self.now = max(self.now, now)
+        second = int(self.now - self.start)
+        while self.sampled < second:
+            self.sampled += 1
+            self.history.append(self.wpm())
+        return self.bucket % self.size
+
+    def sample(self, now):
+        if self.start is not None:
+            self.advance(now)
+
+    def totals(self, now=None):
+        typed, correct, errors = self.typed_sum, self.correct_sum, self.errors_sum
+        if now is None or self.start is None:
+            return typed, correct, errors, self.now
+        bucket = int((now - self.start) / self.resolution)
+        for b in range(self.bucket + 1, min(bucket, self.bucket + self.size) + 1):
+            i = b % self.size
+            typed -= self.typed[i]
+            correct -= self.correct[i]
+            errors -= self.errors[i]
+        return typed, correct, errors, max(self.now, now)
+
+    def key(self, now, correct):
+        i = self.advance(now)
+        self.typed[i] += 1
+        self.typed_sum += 1
+        if correct:
+            self.correct[i] += 1
+            self.correct_sum += 1
+        else:
+            self.errors[i] += 1
+            self.errors_sum += 1
+        if self.word_start is None:
+            self.word_start = now
+
+    def backspace(self, now, was_correct):
+        i = self.advance(now)
+        if was_correct:
+            self.correct[i] -= 1
+            self.correct_sum -= 1
+
+    def word_end(self, now, chars):
+        self.advance(now)
+        if self.word_start is not None and now > self.word_start:
+            self.burst = chars / 5 / ((now - self.word_start) / 60)
+            self.best_burst = max(self.best_burst, self.burst)
+        self.word_start = now
+
+    def minutes(self, now):
+        return max(min(self.window, now - self.start), self.resolution) / 60
+
+    def wpm(self, now=None):
+        if self.start is None:
+            return 0
+        _, correct, _, latest = self.totals(now)
+        return max(0, correct) / 5 / self.minutes(latest)
+
+    def raw_wpm(self, now=None):
+        if self.start is None:
+            return 0
+        typed, _, _, latest = self.totals(now)
+        return typed / 5 / self.minutes(latest)
+
+    def accuracy(self, now=None):
+        typed, _, errors, _ = self.totals(now)
+        return (typed - errors) / typed * 100 if typed else 100
+
+    def snapshot(self, now=None):
+        return {
+            "wpm": self.wpm(now),
+            "raw_wpm": self.raw_wpm(now),
+            "accuracy": self.accuracy(now),
+            "burst": self.burst,
+            "best_burst": self.best_burst
+        }
@@ -1,37 +1,56 @@
 import sys
+import time
 
 import pygame
 
+from frame_stats import FrameProfiler
 from game_modes import GameManager
-from resources import load_font
+from render_scheduler import RenderScheduler
+from resources import configure_asset_cache, load_font
+from results_store import ResultsStore
 from scoreboard import Scoreboard
 from settings import Settings
 from ui import UI
 
 
 def main():
+    started = time.perf_counter()
     pygame.init()
     pygame.display.set_caption("Typemaster")
     settings = Settings()
+    configure_asset_cache(settings.asset_cache_dir)
 
     info = pygame.display.Info()
     screen = pygame.display.set_mode((info.current_w, info.current_h), pygame.FULLSCREEN)
 
     base_font = load_font(settings.font_path, settings.font_size)
-    game_manager = GameManager(settings, base_font)
+    results = ResultsStore(settings.results_db_path) if settings.results_db_path else None
+    game_manager = GameManager(settings, base_font, results=results)
     ui = UI(screen, settings, base_font, game_manager)
     scoreboard = Scoreboard(screen, settings, base_font)
     clock = pygame.time.Clock()
+    profiler = FrameProfiler(settings)
+    scheduler = RenderScheduler()
 
     running = True
     while running:
-        for event in pygame.event.get():
+        timeout = 0 if ui.is_animating() or profiler.show_overlay else ui.next_wake_ms()
+        events = scheduler.wait_events(timeout)
+        profiler.start_frame(timeout == 0)
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            scheduler.handle_event(event)
+            if event.type == pygame.KEYDOWN:
+                profiler.key_pressed()
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                    continue
             ui.handle_event(event)
             new_state = scoreboard.handle_event(event)
             if new_state:
                 ui.state = new_state
+        profiler.lap("events")
 
         game_manager.update()
         ui.update()
@@ -39,15 +58,34 @@ def main():
         if game_manager.session_finished and ui.state == "game":
             ui.state = "scoreboard"
             scoreboard.update_score(game_manager)
+        profiler.lap("update")
 
-        screen.fill(settings.bg_color)
-        if ui.state == "scoreboard":
-            scoreboard.draw()
+        render_key = ui.render_key()
+        if scheduler.needs_redraw(render_key) or profiler.show_overlay:
+            screen.fill(settings.bg_color)
+            if ui.state == "scoreboard":
+                scoreboard.draw()
+                rects = [screen.get_rect()]
+            else:
+                ui.draw()
+                rects = ui.dirty_rects
+            rects = rects + profiler.draw_overlay(screen, ui.menu_font)
+            profiler.lap("draw")
+            scheduler.present(render_key, rects)
+            profiler.lap("flip")
+            if profiler.first_frame_ms is None:
+                profiler.first_frame_ms = (time.perf_counter() - started) * 1000
+                print(f"Время до первого кадра: {profiler.first_frame_ms:.1f} мс")
+            profiler.end_frame()
         else:
-            ui.draw()
-        pygame.display.flip()
+            profiler.skip_frame()
         clock.tick(settings.fps)
 
+    if settings.perf_export_path:
+        profiler.export(settings.perf_export_path)
+    game_manager.close()
+    if results:
+        results.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,121 @@
+import mmap
+import os
+import random
+import struct
+from array import array
+
+from resources import asset_cache_path, get_cached, write_file_atomic
+
+QUOTE_INDEX_MAGIC = b"TMQINDEX"
+QUOTE_INDEX_VERSION = 1
+QUOTE_INDEX_HEADER = struct.Struct("<8sIIIIII")
+QUOTE_LENGTH_BUCKETS = {"short": (0, 100), "medium": (100, 300), "long": (300, None)}
+
+
+def length_bucket(length):
+    for name, (low, high) in QUOTE_LENGTH_BUCKETS.items():
+        if length >= low and (high is None or length < high):
+            return name
+    return None
+
+
+def build_quote_index(path):
+    spans = array("Q")
+    buckets = {name: array("I") for name in QUOTE_LENGTH_BUCKETS}
+    charset = set()
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped:
+                start = offset + len(line) - len(line.lstrip())
+                quote = stripped.decode("utf-8")
+                buckets[length_bucket(len(quote))].append(len(spans) // 2)
+                spans.extend((start, start + len(stripped)))
+                charset.update(quote)
+            offset += len(line)
+    return spans, buckets, "".join(sorted(charset))
+
+
+def write_quote_index(index_path, spans, buckets, charset):
+    charset_bytes = charset.encode("utf-8")
+
+    def write(temp_path):
+        with open(temp_path, "wb") as f:
+            f.write(QUOTE_INDEX_HEADER.pack(QUOTE_INDEX_MAGIC, QUOTE_INDEX_VERSION, len(spans) // 2,
+                                            *(len(ids) for ids in buckets.values()), len(charset_bytes)))
+            spans.tofile(f)
+            for ids in buckets.values():
+                ids.tofile(f)
+            f.write(charset_bytes)
+    write_file_atomic(index_path, write)
+
+
+def read_quote_index(index_path):
+    with open(index_path, "rb") as f:
+        data = f.read()
+    magic, version, count, *sizes, charset_size = QUOTE_INDEX_HEADER.unpack_from(data, 0)
+    if magic != QUOTE_INDEX_MAGIC or version != QUOTE_INDEX_VERSION:
+        raise ValueError(f"Неверный формат индекса цитат: {index_path}")
+    position = QUOTE_INDEX_HEADER.size
+    spans = array("Q")
+    spans.frombytes(data[position:position + 16 * count])
+    position += 16 * count
+    buckets = {}
+    for name, size in zip(QUOTE_LENGTH_BUCKETS, sizes):
+        buckets[name] = array("I")
+        buckets[name].frombytes(data[position:position + 4 * size])
+        position += 4 * size
+    return spans, buckets, data[position:position + charset_size].decode("utf-8")
+
+
+class QuoteStore:
+    def __init__(self, path):
+        self.path = path
+        self.spans, self.buckets, self.charset = self.load_index()
+        self.data = None
+        if len(self.spans):
+            with open(path, "rb") as f:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def load_index(self):
+        index_path = asset_cache_path(self.path, "quote-index", os.path.getsize(self.path),
+                                      tuple(QUOTE_LENGTH_BUCKETS.items()), extension=".qidx")
+        if index_path and os.path.exists(index_path):
+            try:
+                return read_quote_index(index_path)
+            except (OSError, ValueError, struct.error):
+                pass
+        index = build_quote_index(self.path)
+        if index_path:
+            write_quote_index(index_path, *index)
+        return index
+
+    def __len__(self):
+        return len(self.spans) // 2
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("quote index out of range")
+        return self.data[self.spans[2 * index]:self.spans[2 * index + 1]].decode("utf-8")
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def random_quote(self, length="all", rng=random):
+        ids = self.buckets.get(length)
+        if ids:
+            return self[ids[rng.randrange(len(ids))]]
+        if not len(self):
+            return None
+        return self[rng.randrange(len(self))]
+
+
+def get_quote_store(path):
+    if not os.path.exists(path):
+        print(f"Не удалось найти файл с цитатами: {path}")
+        return None
+    return get_cached(path, QuoteStore, preprocess=False)
@@ -0,0 +1,57 @@
+import json
+import time
+
+from resources import write_file_atomic
+
+RECORDING_VERSION = 1
+
+
+class SessionRecorder:
+    def __init__(self, header, clock=time.monotonic_ns):
+        self.header = dict(header, version=RECORDING_VERSION)
+        self.clock = clock
+        self.last_time = clock()
+        self.events = []
+
+    def record(self, kind, payload=None):
+        now = self.clock()
+        self.events.append((now - self.last_time, kind, payload))
+        self.last_time = now
+
+    def record_key(self, char):
+        self.record("k", char)
+
+    def record_backspace(self):
+        self.record("b")
+
+    def record_words(self, words):
+        self.record("w", list(words))
+
+    def record_finish(self):
+        self.record("f")
+
+    def save(self, path):
+        def write(temp_path):
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self.header, ensure_ascii=False) + "\n")
+                for delta, kind, payload in self.events:
+                    if payload is None:
+                        f.write(f"{delta}\t{kind}\n")
+                    else:
+                        f.write(f"{delta}\t{kind}\t{json.dumps(payload, ensure_ascii=False)}\n")
+        return write_file_atomic(path, write)
+
+
+def load_recording(path):
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Неподдерживаемая версия записи: {header.get('version')}")
+        events = []
+        timestamp = 0
+        for line in f:
+            parts = line.rstrip("\n").split("\t", 2)
+            timestamp += int(parts[0])
+            payload = json.loads(parts[2]) if len(parts) > 2 else None
+            events.append((timestamp, parts[1], payload))
+    return header, events
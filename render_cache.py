@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class GlyphCache:
+    def __init__(self, max_size=2048):
+        self.max_size = max_size
+        self.glyphs = OrderedDict()
+
+    def get(self, font, char, color):
+        key = (font, char, tuple(color))
+        surface = self.glyphs.get(key)
+        if surface is not None:
+            self.glyphs.move_to_end(key)
+            return surface
+        surface = font.render(char, True, color)
+        self.glyphs[key] = surface
+        if len(self.glyphs) > self.max_size:
+            self.glyphs.popitem(last=False)
+        return surface
+
+    def width(self, font, char, color):
+        return self.get(font, char, color).get_width()
+
+    def clear(self):
+        self.glyphs.clear()
+
+
+class TextCache:
+    def __init__(self):
+        self.entries = {}
+
+    def render(self, slot, font, text, color):
+        key = (font, text, tuple(color))
+        entry = self.entries.get(slot)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        surface = font.render(text, True, color)
+        self.entries[slot] = (key, surface)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+
+class GlyphAtlas:
+    def __init__(self, font, chars, colors, max_width=2048):
+        self.font = font
+        self.areas = {}
+        glyphs = []
+        x = y = row_height = 0
+        for color in colors:
+            for char in sorted(chars):
+                surface = font.render(char, True, color)
+                width, height = surface.get_size()
+                if x and x + width > max_width:
+                    x = 0
+                    y += row_height
+                    row_height = 0
+                glyphs.append((surface, (x, y)))
+                self.areas[(char, tuple(color))] = pygame.Rect(x, y, width, height)
+                x += width
+                row_height = max(row_height, height)
+        self.surface = pygame.Surface((max_width if y else max(x, 1), max(y + row_height, 1)), pygame.SRCALPHA)
+        for surface, position in glyphs:
+            self.surface.blit(surface, position, special_flags=pygame.BLEND_RGBA_MAX)
+
+    def area(self, char, color):
+        return self.areas.get((char, color))
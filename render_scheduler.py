@@ -0,0 +1,36 @@
+import pygame
+
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED)
+
+
+class RenderScheduler:
+    def __init__(self):
+        self.last_key = None
+        self.last_rects = []
+        self.full_redraw = True
+
+    def wait_events(self, timeout):
+        if timeout == 0:
+            return pygame.event.get()
+        if timeout is None:
+            events = [pygame.event.wait()]
+        else:
+            events = [pygame.event.wait(timeout)]
+        events += pygame.event.get()
+        return [event for event in events if event.type != pygame.NOEVENT]
+
+    def handle_event(self, event):
+        if event.type in EXPOSE_EVENTS:
+            self.full_redraw = True
+
+    def needs_redraw(self, key):
+        return self.full_redraw or key != self.last_key
+
+    def present(self, key, rects):
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.last_rects + rects)
+        self.last_key = key
+        self.last_rects = rects
+        self.full_redraw = False
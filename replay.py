@@ -0,0 +1,68 @@
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from game_modes import GameManager
+from recording import load_recording
+from settings import Settings
+
+
+def replay_session(header, events, settings=None, realtime=False):
+    settings = settings or Settings()
+    settings.record_sessions = False
+    settings.numbers_enabled = header.get("numbers", False)
+    settings.punctuation_enabled = header.get("punctuation", False)
+
+    virtual_ns = [0]
+    game_manager = GameManager(settings, None, (header["mode"], *header.get("parameters", [])),
+                               clock=lambda: 1 + virtual_ns[0] / 1e9,
+                               word_feed=iter([payload for _, kind, payload in events if kind == "w"]))
+
+    started = time.monotonic_ns()
+    try:
+        for timestamp, kind, payload in events:
+            if realtime:
+                delay = (started + timestamp - time.monotonic_ns()) / 1e9
+                if delay > 0:
+                    time.sleep(delay)
+            virtual_ns[0] = timestamp
+            if kind == "k":
+                game_manager.handle_input(payload)
+            elif kind == "b":
+                game_manager.handle_backspace()
+            elif kind == "f":
+                game_manager.update()
+                if not game_manager.selected_mode.finished:
+                    game_manager.selected_mode.finish()
+            game_manager.update()
+    finally:
+        game_manager.close()
+    return game_manager
+
+
+def replay_file(path, settings=None, realtime=False):
+    header, events = load_recording(path)
+    return replay_session(header, events, settings, realtime)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Typemaster sessions headless")
+    parser.add_argument("recordings", nargs="+")
+    parser.add_argument("--realtime", action="store_true", help="replay at recorded speed")
+    args = parser.parse_args()
+
+    for path in args.recordings:
+        started = time.perf_counter()
+        game_manager = replay_file(path, realtime=args.realtime)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = game_manager.get_stats()
+        print(f"{path}: WPM {stats['wpm']:.1f}, accuracy {stats['accuracy']:.1f}%, "
+              f"errors {stats['errors']}, time {stats['time_elapsed']:.2f}s "
+              f"(replayed in {elapsed_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
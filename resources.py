@@ -1,7 +1,50 @@
+import hashlib
+import io
 import os
+import pickle
 
 import pygame
 
+from corpus import CompiledCorpus, compiled_path
+
+ASSET_CACHE_VERSION = 1
+
+asset_cache_dir = None
+_font_data = {}
+
+
+def configure_asset_cache(path):
+    global asset_cache_dir
+    asset_cache_dir = path
+    if path:
+        os.makedirs(path, exist_ok=True)
+
+
+def asset_cache_path(source, *params, extension):
+    if not asset_cache_dir:
+        return None
+    try:
+        mtime = os.stat(source).st_mtime_ns
+    except OSError:
+        return None
+    key = "|".join(str(part) for part in (ASSET_CACHE_VERSION, os.path.abspath(source), mtime) + params)
+    return os.path.join(asset_cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + extension)
+
+
+def write_file_atomic(path, write):
+    directory, name = os.path.split(path)
+    base, extension = os.path.splitext(name)
+    temp_path = os.path.join(directory, f".{base}.{os.getpid()}.tmp{extension}")
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+        return True
+    except (OSError, pygame.error) as e:
+        print(f"Не удалось записать файл {path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
 
 def load_image(path):
     if not os.path.exists(path):
@@ -11,11 +54,29 @@ def load_image(path):
     return image.convert_alpha()
 
 
+def load_scaled_image(path, size):
+    cached = asset_cache_path(path, size, extension=".png")
+    if cached and os.path.exists(cached):
+        return pygame.image.load(cached).convert_alpha()
+    image = load_image(path)
+    if image is None:
+        return None
+    image = pygame.transform.smoothscale(image, size)
+    if cached:
+        write_file_atomic(cached, lambda temp_path: pygame.image.save(image, temp_path))
+    return image
+
+
 def load_font(path, size):
     if not os.path.exists(path):
         print(f"Не удалось найти файл шрифта: {path}")
         return pygame.font.SysFont(None, size)
-    return pygame.font.Font(path, size)
+    data = _font_data.get(path)
+    if data is None:
+        with open(path, "rb") as f:
+            data = f.read()
+        _font_data[path] = data
+    return pygame.font.Font(io.BytesIO(data), size)
 
 
 def load_wordlist(path):
@@ -27,11 +88,61 @@ def load_wordlist(path):
     return words
 
 
-def load_quote_list(path):
-    if not os.path.exists(path):
-        print(f"Не удалось найти файл с цитатами: {path}")
-        return []
-    with open(path, "r", encoding="utf-8") as f:
-        quotes = f.readlines()
-    quotes = [q.strip() for q in quotes if q.strip()]
-    return quotes
+_corpus_cache = {}
+
+
+def get_cached(path, loader, preprocess=True):
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        _corpus_cache.pop(path, None)
+        return loader(path)
+    cached = _corpus_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    data = load_preprocessed(path, loader) if preprocess else loader(path)
+    _corpus_cache[path] = (mtime, data)
+    return data
+
+
+def evict_cached(path):
+    _corpus_cache.pop(path, None)
+    _corpus_cache.pop(compiled_path(path), None)
+
+
+def load_preprocessed(path, loader):
+    cached = asset_cache_path(path, loader.__name__, extension=".pickle")
+    if cached and os.path.exists(cached):
+        try:
+            with open(cached, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+    data = loader(path)
+    if cached:
+        def write(temp_path):
+            with open(temp_path, "wb") as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        write_file_atomic(cached, write)
+    return data
+
+
+def get_wordlist(path):
+    compiled = compiled_path(path)
+    try:
+        compiled_mtime = os.stat(compiled).st_mtime_ns
+    except OSError:
+        compiled_mtime = None
+    if compiled_mtime is not None and (not os.path.exists(path) or compiled_mtime >= os.stat(path).st_mtime_ns):
+        return get_cached(compiled, CompiledCorpus, preprocess=False)
+    return get_cached(path, load_wordlist)
+
+
+def wordlist_chars(words):
+    charset = getattr(words, "charset", None)
+    if charset is not None:
+        return set(charset)
+    chars = set()
+    for word in words:
+        chars.update(word)
+    return chars
@@ -0,0 +1,110 @@
+import sqlite3
+import time
+
+from batch_writer import BatchWriter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    parameter TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    wpm REAL NOT NULL,
+    accuracy REAL NOT NULL,
+    errors INTEGER NOT NULL,
+    time_elapsed REAL NOT NULL,
+    chars_typed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_history ON results (user, mode, parameter, timestamp);
+CREATE INDEX IF NOT EXISTS results_wpm ON results (user, mode, parameter, wpm);
+CREATE TABLE IF NOT EXISTS result_totals (
+    user TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    parameter TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    best_wpm REAL NOT NULL,
+    PRIMARY KEY (user, mode, parameter)
+);
+CREATE TABLE IF NOT EXISTS result_buckets (
+    user TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    parameter TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (user, mode, parameter, bucket)
+);
+CREATE TRIGGER IF NOT EXISTS results_totals AFTER INSERT ON results BEGIN
+    INSERT INTO result_totals VALUES (NEW.user, NEW.mode, NEW.parameter, 1, NEW.wpm)
+    ON CONFLICT (user, mode, parameter) DO UPDATE SET count = count + 1, best_wpm = MAX(best_wpm, NEW.wpm);
+    INSERT INTO result_buckets VALUES (NEW.user, NEW.mode, NEW.parameter, CAST(NEW.wpm AS INTEGER), 1)
+    ON CONFLICT (user, mode, parameter, bucket) DO UPDATE SET count = count + 1;
+END;
+"""
+
+
+def parameter_key(parameters):
+    return " ".join(str(parameter) for parameter in parameters if parameter is not None)
+
+
+class ResultsStore(BatchWriter):
+    def __init__(self, path, batch_size=256):
+        self.path = path
+        self.reader = None
+        self.connection = None
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        connection.close()
+        super().__init__(batch_size)
+
+    def open_writer(self):
+        self.connection = sqlite3.connect(self.path)
+
+    def write_batch(self, rows):
+        try:
+            with self.connection:
+                self.connection.executemany("INSERT INTO results (user, mode, parameter, timestamp, wpm, accuracy, "
+                                            "errors, time_elapsed, chars_typed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                            rows)
+        except sqlite3.Error as e:
+            print(f"Не удалось сохранить результаты: {e}")
+
+    def close_writer(self):
+        self.connection.close()
+        self.connection = None
+
+    def add(self, user, mode, parameter, stats, timestamp=None):
+        self.put((user, mode, parameter, timestamp or time.time(), stats["wpm"], stats["accuracy"],
+                          stats["errors"], stats["time_elapsed"], stats["chars_typed"]))
+
+    def history(self, user, mode, parameter, wpm, window=10):
+        if self.reader is None:
+            self.reader = sqlite3.connect(self.path)
+        key = (user, mode, parameter)
+        count, best = self.reader.execute(
+            "SELECT count, best_wpm FROM result_totals WHERE user = ? AND mode = ? AND parameter = ?",
+            key).fetchone() or (0, 0)
+        bucket = int(wpm)
+        above = self.reader.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM result_buckets WHERE user = ? AND mode = ? AND parameter = ? "
+            "AND bucket > ?", key + (bucket,)).fetchone()[0]
+        above += self.reader.execute(
+            "SELECT COUNT(*) FROM results WHERE user = ? AND mode = ? AND parameter = ? AND wpm > ? AND wpm < ?",
+            key + (wpm, bucket + 1)).fetchone()[0]
+        recent = [row[0] for row in self.reader.execute(
+            "SELECT wpm FROM results WHERE user = ? AND mode = ? AND parameter = ? ORDER BY timestamp DESC LIMIT ?",
+            key + (window - 1,))]
+        recent.append(wpm)
+        return {
+            "count": count + 1,
+            "best_wpm": max(best, wpm),
+            "average_wpm": sum(recent) / len(recent),
+            "percentile": (count - above + 1) / (count + 1) * 100
+        }
+
+    def close(self):
+        super().close()
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
@@ -0,0 +1,74 @@
+import random
+from array import array
+from functools import lru_cache
+
+SAMPLING_CURVES = ("uniform", "zipf")
+
+
+class AliasSampler:
+    def __init__(self, weights):
+        size = len(weights)
+        if not size:
+            raise ValueError("AliasSampler needs at least one weight")
+        total = sum(weights)
+        scaled = [weight * size / total for weight in weights]
+        self.size = size
+        self.prob = array("d", [1.0]) * size
+        self.alias = array("I", range(size))
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+    def draw(self, rng=random):
+        index = rng.randrange(self.size)
+        return index if rng.random() < self.prob[index] else self.alias[index]
+
+    def sample(self, count, rng=random):
+        indices = []
+        previous = None
+        while len(indices) < count:
+            index = self.draw(rng)
+            if index != previous or self.size == 1:
+                indices.append(index)
+                previous = index
+        return indices
+
+
+def frequency_weights(size, curve="zipf", exponent=1.0, top_n=0):
+    if curve not in SAMPLING_CURVES:
+        raise ValueError(f"Неизвестная кривая выборки слов: {curve} (допустимо: {', '.join(SAMPLING_CURVES)})")
+    if top_n > 0:
+        size = min(size, top_n)
+    if curve == "zipf":
+        return [1.0 / (rank + 1) ** exponent for rank in range(size)]
+    return [1.0] * size
+
+
+@lru_cache(maxsize=16)
+def get_sampler(size, curve="zipf", exponent=1.0, top_n=0):
+    return AliasSampler(frequency_weights(size, curve, exponent, top_n))
+
+
+def spread_repeats(words, rng=random):
+    for i in range(1, len(words)):
+        if words[i] != words[i - 1]:
+            continue
+        for _ in range(8):
+            j = rng.randrange(len(words))
+            word = words[j]
+            if word == words[i] or (i + 1 < len(words) and word == words[i + 1]):
+                continue
+            if (j > 0 and words[j - 1] == words[i]) or (j + 1 < len(words) and words[j + 1] == words[i]):
+                continue
+            words[i], words[j] = words[j], words[i]
+            break
+    return words
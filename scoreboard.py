@@ -1,26 +1,99 @@
 import pygame
 
+from render_cache import TextCache
+from resources import load_font
+
+KEYBOARD_ROWS = (
+    ("qwertyuiop", "asdfghjkl", "zxcvbnm"),
+    ("йцукенгшщзхъ", "фывапролджэ", "ячсмитьбю")
+)
+
 
 class Scoreboard:
     def __init__(self, screen, settings, font):
         self.screen = screen
         self.settings = settings
         self.font = font
+        self.small_font = load_font(settings.font_path, settings.menu_font_size)
         self.show_score = False
         self.stats = {}
+        self.history = None
+        self.graph = None
+        self.analytics = None
+        self.text_cache = TextCache()
+        self.overlay = pygame.Surface((self.screen.get_width(), self.screen.get_height()))
+        self.overlay.set_alpha(200)
+        self.overlay.fill((0, 0, 0))
 
     def update_score(self, game_manager):
         self.stats = game_manager.get_stats()
+        self.history = game_manager.result_history
+        self.graph = self.render_graph(list(game_manager.selected_mode.live_stats.history))
+        self.analytics = self.render_analytics(game_manager.analytics)
         self.show_score = True
 
+    def render_graph(self, samples):
+        if len(samples) < 2:
+            return None
+        width = self.screen.get_width() * 3 // 5
+        height = 160
+        graph = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.line(graph, (100, 100, 100), (0, height - 1), (width, height - 1))
+        top = max(max(samples), 1)
+        label = self.text_cache.render("graph_top", self.small_font, f"{int(top)} WPM", (200, 200, 200))
+        graph.blit(label, (0, 0))
+        plot_top = label.get_height() + 4
+        points = [(i * (width - 1) / (len(samples) - 1), plot_top + (height - 2 - plot_top) * (1 - value / top))
+                  for i, value in enumerate(samples)]
+        pygame.draw.lines(graph, self.settings.correct_color, False, points, 2)
+        return graph
+
+    def render_analytics(self, analytics):
+        if not analytics or not analytics["errors"]:
+            return None
+        errors = analytics["errors"]
+        rows = max(KEYBOARD_ROWS, key=lambda layout: sum(char in errors for row in layout for char in row))
+        cell = 30
+        lines = []
+        if analytics["slowest_keys"]:
+            lines.append("Slow keys: " + "  ".join(f"{char} {int(analytics['keys'][char]['mean_ms'])}ms"
+                                                   for char in analytics["slowest_keys"]))
+        if analytics["slowest_bigrams"]:
+            lines.append("Slow pairs: " + "  ".join(f"{pair} {int(analytics['bigrams'][pair]['mean_ms'])}ms"
+                                                    for pair in analytics["slowest_bigrams"]))
+        line_surfaces = [self.small_font.render(line, True, (200, 200, 200)) for line in lines]
+        heatmap_width = max(len(row) for row in rows) * cell + cell
+        width = heatmap_width + 20 + max((surface.get_width() for surface in line_surfaces), default=0)
+        surface = pygame.Surface((width, len(rows) * cell), pygame.SRCALPHA)
+        for r, row in enumerate(rows):
+            for c, char in enumerate(row):
+                rect = pygame.Rect(r * cell // 2 + c * cell, r * cell, cell - 2, cell - 2)
+                entry = errors.get(char)
+                if entry:
+                    heat = min(1, entry["rate"] * 2)
+                    color = tuple(int(base + (error - base) * heat) for base, error in
+                                  zip(self.settings.menu_button_color, self.settings.error_color))
+                else:
+                    color = (30, 30, 30)
+                pygame.draw.rect(surface, color, rect, border_radius=4)
+                label = self.small_font.render(char, True, (220, 220, 220))
+                surface.blit(label, label.get_rect(center=rect.center))
+        y = 0
+        for line_surface in line_surfaces:
+            surface.blit(line_surface, (heatmap_width + 20, y))
+            y += line_surface.get_height() + 8
+        return surface
+
     def draw(self):
         if not self.show_score:
             return
 
-        overlay = pygame.Surface((self.screen.get_width(), self.screen.get_height()))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.overlay, (0, 0))
+        if self.graph:
+            self.screen.blit(self.graph, ((self.screen.get_width() - self.graph.get_width()) // 2, 40))
+        if self.analytics:
+            self.screen.blit(self.analytics, ((self.screen.get_width() - self.analytics.get_width()) // 2,
+                                              self.screen.get_height() - self.analytics.get_height() - 20))
 
         wpm_text = f"WPM: {int(self.stats.get('wpm', 0))}"
         accuracy_text = f"Accuracy: {int(self.stats.get('accuracy', 0))}%"
@@ -31,17 +104,21 @@ class Scoreboard:
         time_text = f"Time: {minutes}m {seconds}s"
 
         lines = [wpm_text, accuracy_text, errors_text, time_text]
+        if self.history:
+            lines.append(f"Best: {int(self.history['best_wpm'])}  "
+                         f"Avg({self.settings.results_rolling_window}): {int(self.history['average_wpm'])}  "
+                         f"Percentile: {int(self.history['percentile'])}%")
         x = self.screen.get_width() // 2
         y = self.screen.get_height() // 2 - 100
 
-        for line in lines:
-            surf = self.font.render(line, True, (255, 255, 255))
+        for i, line in enumerate(lines):
+            surf = self.text_cache.render(i, self.font, line, (255, 255, 255))
             rect = surf.get_rect(center=(x, y))
             self.screen.blit(surf, rect)
             y += 60
 
         instr_text = "Нажмите пробел, чтобы вернуться в меню."
-        instr_surf = self.font.render(instr_text, True, (200, 200, 200))
+        instr_surf = self.text_cache.render("instructions", self.font, instr_text, (200, 200, 200))
         instr_rect = instr_surf.get_rect(center=(x, y + 60))
         self.screen.blit(instr_surf, instr_rect)
 
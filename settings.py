@@ -1,6 +1,11 @@
+import os
+
+
 class Settings:
     def __init__(self):
         self.fps = 60
+        self.show_perf_overlay = False
+        self.perf_export_path = "perf_histograms.json"
 
         self.bg_color = (20, 20, 20)
         self.text_color = (120, 120, 120)
@@ -9,9 +14,14 @@ class Settings:
         self.option_enabled_color = (0, 255, 0)
         self.option_disabled_color = (255, 0, 0)
 
+        self.asset_cache_dir = ".cache"
+
         self.font_path = "assets/fonts/Consolas.ttf"
         self.font_size = 48
         self.menu_font_size = 24
+        self.glyph_cache_size = 2048
+        self.visible_lines = 3
+        self.use_glyph_atlas = False
 
         self.time_modes = [15, 30, 60, 120]
         self.word_modes = [10, 25, 50, 100]
@@ -21,6 +31,10 @@ class Settings:
         self.numbers_enabled = False
         self.punctuation_enabled = False
 
+        self.word_sampling = "uniform"
+        self.zipf_exponent = 1.0
+        self.sampling_top_n = 0
+
         self.icon_paths = {
             "time": "assets/icons/time.png",
             "words": "assets/icons/words.png",
@@ -46,9 +60,28 @@ class Settings:
         self.color_transition_speed = 0.05
 
         self.quote_source = "data/quotes.txt"
+        self.quote_length = "all"
         self.wordlist_path = "data/words.txt"
         self.numbers_path = "data/numbers.txt"
         self.punctuation_path = "data/punctuation.txt"
         self.languages_path = "data/language_words.txt"
+        self.languages_manifest = "data/languages.json"
+        self.language = "russian"
 
         self.max_zen_words = 50
+        self.show_live_stats = True
+        self.live_stats_window = 5.0
+        self.book_page_words = 50
+        self.adaptive_wordlist_path = "data/words.txt"
+        self.adaptive_targets = 6
+        self.adaptive_focus = 0.7
+        self.key_profile_path = "key_profile.json"
+        self.book_positions_path = "book_positions.json"
+        self.prefetch_batches = 2
+
+        self.user_name = os.environ.get("TYPEMASTER_USER", "guest")
+        self.results_db_path = "results.sqlite3"
+        self.results_rolling_window = 10
+
+        self.record_sessions = False
+        self.recordings_dir = "recordings"
@@ -0,0 +1,105 @@
+class TextLayout:
+    def __init__(self, font, glyphs, settings):
+        self.font = font
+        self.glyphs = glyphs
+        self.settings = settings
+        self.mode = None
+        self.generation = None
+        self.size = None
+        self.max_line_width = 0
+        self.space_width = 0
+        self.first_word = 0
+        self.first_line = 0
+        self.word_widths = []
+        self.word_lines = []
+        self.word_offsets = []
+        self.lines = []
+        self.top_line = 0
+
+    def sync(self, mode, size):
+        if mode is not self.mode or mode.generation != self.generation or size != self.size:
+            self.reset(mode, size)
+        words = mode.words
+        caret = min(mode.current_word_index, len(words) - 1)
+        if caret < 0:
+            self.top_line = 0
+            return
+        self.layout_words(words, caret + 1)
+        self.top_line = max(self.first_line, self.word_lines[caret - self.first_word] - 1)
+        self.layout_lines(words, self.top_line + self.settings.visible_lines + 1)
+        if self.top_line - self.first_line > self.settings.visible_lines:
+            self.discard_lines(self.top_line)
+
+    def reset(self, mode, size):
+        self.mode = mode
+        self.generation = mode.generation
+        self.size = size
+        self.max_line_width = size[0] - 100
+        self.space_width = self.glyphs.width(self.font, " ", self.settings.text_color)
+        self.first_word = getattr(mode.words, "base", 0)
+        self.first_line = 0
+        self.word_widths = []
+        self.word_lines = []
+        self.word_offsets = []
+        self.lines = []
+        self.top_line = 0
+
+    def words_end(self):
+        return self.first_word + len(self.word_widths)
+
+    def lines_end(self):
+        return self.first_line + len(self.lines)
+
+    def layout_words(self, words, end):
+        while self.words_end() < min(end, len(words)):
+            self.add_word(words[self.words_end()])
+
+    def layout_lines(self, words, line_count):
+        while self.lines_end() < line_count and self.words_end() < len(words):
+            self.add_word(words[self.words_end()])
+
+    def add_word(self, word):
+        i = self.words_end()
+        word_width = sum(self.glyphs.width(self.font, c, self.settings.text_color) for c in word)
+        if not self.lines or self.lines[-1][1] + self.space_width + word_width > self.max_line_width:
+            self.lines.append([i, 0])
+        line = self.lines[-1]
+        if line[0] != i:
+            line[1] += self.space_width
+        self.word_widths.append(word_width)
+        self.word_lines.append(self.lines_end() - 1)
+        self.word_offsets.append(line[1])
+        line[1] += word_width
+
+    def discard_lines(self, line_index):
+        word_index = self.lines[line_index - self.first_line][0]
+        del self.lines[:line_index - self.first_line]
+        del self.word_widths[:word_index - self.first_word]
+        del self.word_lines[:word_index - self.first_word]
+        del self.word_offsets[:word_index - self.first_word]
+        self.first_line = line_index
+        self.first_word = word_index
+
+    def line_height(self):
+        return self.settings.font_size + 15
+
+    def visible_range(self):
+        if not self.lines:
+            return 0, 0
+        last_line = min(self.top_line + self.settings.visible_lines, self.lines_end()) - 1
+        return self.lines[self.top_line - self.first_line][0], self.line_end(last_line)
+
+    def text_top(self):
+        shown_lines = min(self.settings.visible_lines, len(self.lines))
+        return (self.size[1] - shown_lines * self.line_height()) // 2
+
+    def line_end(self, line_index):
+        if line_index + 1 < self.lines_end():
+            return self.lines[line_index + 1 - self.first_line][0]
+        return self.words_end()
+
+    def word_position(self, index):
+        line_index = self.word_lines[index - self.first_word]
+        line_left = (self.size[0] - self.lines[line_index - self.first_line][1]) // 2
+        return (line_left + self.word_offsets[index - self.first_word],
+                self.text_top() + (line_index - self.top_line) * self.line_height())
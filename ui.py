@@ -1,8 +1,10 @@
-import sys
-
 import pygame
 
-from resources import load_image, load_font
+from render_cache import GlyphAtlas, GlyphCache, TextCache
+from language_packs import get_language_registry
+from quote_store import get_quote_store
+from resources import get_wordlist, load_font, load_scaled_image, wordlist_chars
+from text_layout import TextLayout
 
 
 class UI:
@@ -12,13 +14,28 @@ class UI:
         self.font = font
         self.menu_font = load_font(self.settings.font_path, self.settings.menu_font_size)
         self.game_manager = game_manager
+        self.glyph_cache = GlyphCache(self.settings.glyph_cache_size)
+        self.layout = TextLayout(self.font, self.glyph_cache, self.settings)
+        self.text_cache = TextCache()
+        self.glyph_atlas = None
+        if self.settings.use_glyph_atlas:
+            self.glyph_atlas = self.create_glyph_atlas()
 
         self.state = "menu"
         self.input_text = ""
 
+        self.icons = {}
+        for mode in ["time", "words", "quote", "zen", "numbers", "punctuation", "language", "custom", "exit"]:
+            path = self.settings.icon_paths.get(mode)
+            if path:
+                icon = load_scaled_image(path, (40, 40))
+                if icon:
+                    self.icons[mode] = icon
+
         self.mode_buttons = []
         self.option_buttons = []
         self.exit_button = None
+        self.button_surfaces = {}
         self.create_menu_buttons()
 
         self.button_scales = {btn[0]: 0.0 for btn in self.mode_buttons + self.option_buttons}
@@ -29,23 +46,29 @@ class UI:
             "punctuation": list(self.settings.option_disabled_color)
         }
         self.cursor_alpha = 255
-
-        self.icons = {}
-        for mode in ["time", "words", "quote", "zen", "numbers", "punctuation", "language", "custom", "exit"]:
-            path = self.settings.icon_paths.get(mode)
-            if path:
-                icon = load_image(path)
-                if icon:
-                    icon = pygame.transform.smoothscale(icon, (40, 40))
-                    self.icons[mode] = icon
+        self.cursor_surface = pygame.Surface((3, self.settings.font_size), pygame.SRCALPHA)
+        self.cursor_surface_alpha = None
+        self.hovered = None
+        self.dirty_rects = []
 
         self.configuring_mode = None
         self.parameter_buttons = []
         self.panel_y = self.screen.get_height() // 2 - 100
         self.panel_target_y = self.screen.get_height() // 2 - 100
 
+    def create_glyph_atlas(self):
+        chars = set()
+        for path in (self.settings.wordlist_path, self.settings.numbers_path,
+                     self.settings.punctuation_path, get_language_registry(self.settings).get().path):
+            chars.update(wordlist_chars(get_wordlist(path)))
+        quote_store = get_quote_store(self.settings.quote_source)
+        if quote_store:
+            chars.update(quote_store.charset)
+        colors = (self.settings.text_color, self.settings.correct_color, self.settings.error_color)
+        return GlyphAtlas(self.font, chars, colors)
+
     def create_menu_buttons(self):
-        modes = ["time", "words", "quote", "zen", "language", "custom"]
+        modes = ["time", "words", "quote", "zen", "language", "custom", "adaptive"]
         options = ["numbers", "punctuation"]
         buttons_per_row = 3
         mode_rows = (len(modes) + buttons_per_row - 1) // buttons_per_row
@@ -63,7 +86,9 @@ class UI:
         for index, mode_name in enumerate(modes):
             row = index // buttons_per_row
             col = index % buttons_per_row
-            x = start_x + col * (self.settings.menu_button_width + self.settings.menu_horizontal_spacing)
+            row_buttons = min(buttons_per_row, len(modes) - row * buttons_per_row)
+            col += (buttons_per_row - row_buttons) / 2
+            x = start_x + int(col * (self.settings.menu_button_width + self.settings.menu_horizontal_spacing))
             y = start_y + row * (height + spacing)
             rect = pygame.Rect(x, y, self.settings.menu_button_width, height)
             self.mode_buttons.append((mode_name, rect))
@@ -84,6 +109,35 @@ class UI:
         punctuation_rect = pygame.Rect(punctuation_x, option_start_y, self.settings.menu_button_width, height)
         self.option_buttons.append(("punctuation", punctuation_rect))
 
+        self.button_surfaces = {}
+        for name, rect in self.mode_buttons + [self.exit_button]:
+            self.button_surfaces[name] = {
+                "normal": self.render_button(name, rect.size, self.settings.menu_button_color),
+                "hover": self.render_button(name, rect.size, self.settings.menu_button_hover_color)
+            }
+        for name, rect in self.option_buttons:
+            self.button_surfaces[name] = {"label": self.render_button(name, rect.size)}
+
+    def render_button(self, name, size, bg_color=None):
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        rect = surface.get_rect()
+        flags = 0
+        if bg_color:
+            pygame.draw.rect(surface, bg_color, rect, border_radius=8)
+        else:
+            flags = pygame.BLEND_RGBA_MAX
+        text_surface = self.menu_font.render(name.upper(), True, self.settings.menu_button_text_color)
+        icon = self.icons.get(name)
+        if icon:
+            total_width = icon.get_width() + 10 + text_surface.get_width()
+            icon_rect = icon.get_rect(left=(rect.width - total_width) // 2, centery=rect.centery)
+            surface.blit(icon, icon_rect, special_flags=flags)
+            text_rect = text_surface.get_rect(left=icon_rect.right + 10, centery=rect.centery)
+        else:
+            text_rect = text_surface.get_rect(center=rect.center)
+        surface.blit(text_surface, text_rect, special_flags=flags)
+        return surface
+
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
             if self.state == "game":
@@ -124,18 +178,19 @@ class UI:
                             actual_rect = btn[1].copy()
                             actual_rect.y += self.panel_y
                             if actual_rect.collidepoint(event.pos):
-                                option = int(btn[0])
                                 if self.configuring_mode == "time":
-                                    self.game_manager.set_mode("time", option)
+                                    self.game_manager.set_mode("time", int(btn[0]))
                                 elif self.configuring_mode == "words":
-                                    self.game_manager.set_mode("words", option)
+                                    self.game_manager.set_mode("words", int(btn[0]))
+                                elif self.configuring_mode == "language":
+                                    self.game_manager.set_mode("language", btn[0])
                                 self.state = "game"
                                 return
 
     def handle_menu_click(self, mouse_pos):
         for mode_name, rect in self.mode_buttons:
             if rect.collidepoint(mouse_pos):
-                if mode_name in ["time", "words"]:
+                if mode_name in ["time", "words", "language"]:
                     self.configuring_mode = mode_name
                     self.state = "parameter_selection"
                     self.create_parameter_buttons()
@@ -154,17 +209,19 @@ class UI:
                     self.settings.punctuation_enabled = not self.settings.punctuation_enabled
                 return
         if self.exit_button and self.exit_button[1].collidepoint(mouse_pos):
-            pygame.quit()
-            sys.exit()
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
 
     def create_parameter_buttons(self):
         self.parameter_buttons = []
         if self.configuring_mode == "time":
-            options = self.settings.time_modes
+            options = [(str(option), str(option)) for option in self.settings.time_modes]
             label = "Выберите время (секунды):"
         elif self.configuring_mode == "words":
-            options = self.settings.word_modes
+            options = [(str(option), str(option)) for option in self.settings.word_modes]
             label = "Выберите количество слов:"
+        elif self.configuring_mode == "language":
+            options = [(pack.id, pack.name) for pack in get_language_registry(self.settings).packs.values()]
+            label = "Выберите язык:"
         else:
             return
 
@@ -175,15 +232,16 @@ class UI:
         label_rect = pygame.Rect(label_left, label_top, label_width, label_height)
         self.parameter_buttons.append(("label", label_rect, label_surface))
 
-        button_width = 100
         button_height = 50
-        total_width = len(options) * button_width + (len(options) - 1) * 20
-        start_x = (self.screen.get_width() - total_width) // 2
+        text_surfaces = [self.menu_font.render(text, True, self.settings.menu_button_text_color) for _, text in options]
+        button_widths = [max(100, surface.get_width() + 30) for surface in text_surfaces]
+        total_width = sum(button_widths) + (len(options) - 1) * 20
+        x = (self.screen.get_width() - total_width) // 2
         buttons_start_y = label_top + label_height + 10
-        for i, option in enumerate(options):
-            x = start_x + i * (button_width + 20)
+        for (value, _), text_surface, button_width in zip(options, text_surfaces, button_widths):
             rect = pygame.Rect(x, buttons_start_y, button_width, button_height)
-            self.parameter_buttons.append((str(option), rect))
+            self.parameter_buttons.append((value, rect, text_surface))
+            x += button_width + 20
 
     def update(self):
         for btn_name in self.button_scales:
@@ -209,7 +267,64 @@ class UI:
         if self.state == "parameter_selection":
             self.panel_y = self.panel_target_y
 
+        self.hovered = self.find_hovered(pygame.mouse.get_pos())
+
+    def find_hovered(self, mouse_pos):
+        if self.state == "menu":
+            for name, rect in self.mode_buttons + self.option_buttons + [self.exit_button]:
+                if rect.collidepoint(mouse_pos):
+                    return name
+        elif self.state == "parameter_selection":
+            for btn in self.parameter_buttons:
+                if btn[0] != "label" and btn[1].move(0, self.panel_y).collidepoint(mouse_pos):
+                    return btn[0]
+        return None
+
+    def is_animating(self):
+        if self.state == "menu":
+            if any(scale < 1.0 for scale in self.button_scales.values()):
+                return True
+            for opt, enabled in (("numbers", self.settings.numbers_enabled),
+                                 ("punctuation", self.settings.punctuation_enabled)):
+                target_color = self.settings.option_enabled_color if enabled else self.settings.option_disabled_color
+                if any(abs(target_color[i] - self.option_colors[opt][i]) > 1 for i in range(3)):
+                    return True
+        elif self.state == "game":
+            return 0 < self.cursor_alpha < 255
+        return False
+
+    def next_wake_ms(self):
+        if self.state != "game":
+            return None
+        wake = 500 - pygame.time.get_ticks() % 500
+        mode = self.game_manager.selected_mode
+        if mode and getattr(mode, "time_limit", 0) > 0 and mode.start_time != 0 and not mode.finished:
+            remaining = max(0, mode.time_limit - mode.time_elapsed)
+            wake = min(wake, int((remaining - int(remaining)) * 1000) + 1)
+        return wake
+
+    def render_key(self):
+        key = (self.state, self.hovered, self.input_text, self.panel_y, tuple(self.button_scales.values()),
+               tuple(int(c) for opt in ("numbers", "punctuation") for c in self.option_colors[opt]))
+        mode = self.game_manager.selected_mode
+        if self.state == "game" and mode:
+            remaining_time = int(max(0, mode.time_limit - mode.time_elapsed)) if hasattr(mode, "time_limit") else 0
+            key += (id(mode), mode.generation, mode.current_word_index, mode.user_input, self.cursor_alpha,
+                    remaining_time, self.screen.get_size())
+        return key
+
+    def blit(self, surface, dest):
+        rect = self.screen.blit(surface, dest)
+        self.dirty_rects.append(rect)
+        return rect
+
+    def draw_rect(self, color, rect, **kwargs):
+        drawn = pygame.draw.rect(self.screen, color, rect, **kwargs)
+        self.dirty_rects.append(drawn)
+        return drawn
+
     def draw(self):
+        self.dirty_rects = []
         if self.state == "menu":
             self.draw_menu()
         elif self.state == "game":
@@ -220,57 +335,24 @@ class UI:
             self.draw_parameter_selection()
 
     def draw_menu(self):
-        for mode_name, rect in self.mode_buttons:
-            bg_color = self.settings.menu_button_color
-            if rect.collidepoint(pygame.mouse.get_pos()):
-                bg_color = self.settings.menu_button_hover_color
-            scale = self.button_scales[mode_name]
-            scaled_rect = rect.inflate(rect.width * (scale - 1), rect.height * (scale - 1))
-            pygame.draw.rect(self.screen, bg_color, scaled_rect, border_radius=8)
-            icon = self.icons.get(mode_name)
-            if icon:
-                text_surface = self.menu_font.render(mode_name.upper(), True, self.settings.menu_button_text_color)
-                total_width = icon.get_width() + 10 + text_surface.get_width()
-                start_x = scaled_rect.left + (scaled_rect.width - total_width) // 2
-                icon_rect = icon.get_rect(left=start_x, centery=scaled_rect.centery)
-                self.screen.blit(icon, icon_rect)
-                text_rect = text_surface.get_rect(left=icon_rect.right + 10, centery=scaled_rect.centery)
-                self.screen.blit(text_surface, text_rect)
+        for mode_name, rect in self.mode_buttons + [self.exit_button]:
+            variant = "hover" if self.hovered == mode_name else "normal"
+            self.draw_button(self.button_surfaces[mode_name][variant], rect, self.button_scales[mode_name])
 
         for option_name, rect in self.option_buttons:
             bg_color = tuple(int(c) for c in self.option_colors[option_name])
             scale = self.button_scales[option_name]
             scaled_rect = rect.inflate(rect.width * (scale - 1), rect.height * (scale - 1))
-            pygame.draw.rect(self.screen, bg_color, scaled_rect, border_radius=8)
-            icon = self.icons.get(option_name)
-            if icon:
-                text_surface = self.menu_font.render(option_name.upper(), True, self.settings.menu_button_text_color)
-                total_width = icon.get_width() + 10 + text_surface.get_width()
-                start_x = scaled_rect.left + (scaled_rect.width - total_width) // 2
-                icon_rect = icon.get_rect(left=start_x, centery=scaled_rect.centery)
-                self.screen.blit(icon, icon_rect)
-                text_rect = text_surface.get_rect(left=icon_rect.right + 10, centery=scaled_rect.centery)
-                self.screen.blit(text_surface, text_rect)
+            self.draw_rect(bg_color, scaled_rect, border_radius=8)
+            self.draw_button(self.button_surfaces[option_name]["label"], rect, scale)
 
-        if self.exit_button:
-            rect = self.exit_button[1]
-            bg_color = self.settings.menu_button_color
-            if rect.collidepoint(pygame.mouse.get_pos()):
-                bg_color = self.settings.menu_button_hover_color
-            scale = self.button_scales["exit"]
-            scaled_rect = rect.inflate(rect.width * (scale - 1), rect.height * (scale - 1))
-            pygame.draw.rect(self.screen, bg_color, scaled_rect, border_radius=8)
-            text_surface = self.menu_font.render("EXIT", True, self.settings.menu_button_text_color)
-            if self.icons.get("exit"):
-                icon = self.icons.get("exit")
-                total_width = icon.get_width() + 10 + text_surface.get_width()
-                start_x = scaled_rect.left + (scaled_rect.width - total_width) // 2
-                icon_rect = icon.get_rect(left=start_x, centery=scaled_rect.centery)
-                self.screen.blit(icon, icon_rect)
-                text_rect = text_surface.get_rect(left=icon_rect.right + 10, centery=scaled_rect.centery)
-            else:
-                text_rect = text_surface.get_rect(center=scaled_rect.center)
-            self.screen.blit(text_surface, text_rect)
+    def draw_button(self, surface, rect, scale):
+        if scale >= 1.0:
+            self.blit(surface, rect)
+            return
+        scaled_rect = rect.inflate(rect.width * (scale - 1), rect.height * (scale - 1))
+        if scaled_rect.width > 0 and scaled_rect.height > 0:
+            self.blit(pygame.transform.smoothscale(surface, scaled_rect.size), scaled_rect)
 
     def draw_game(self):
         mode = self.game_manager.selected_mode
@@ -279,126 +361,114 @@ class UI:
 
         screen_width = self.screen.get_width()
         screen_height = self.screen.get_height()
-        space_width = self.font.render(" ", True, self.settings.text_color).get_width()
-        max_line_width = screen_width - 100
-        lines = []
-        current_line = []
-        current_line_width = 0
-
-        for i, word in enumerate(mode.words):
+        glyphs = self.glyph_cache
+        layout = self.layout
+        layout.sync(mode, (screen_width, screen_height))
+
+        first_word, last_word = layout.visible_range()
+        for stream in (mode.words, mode.finished_word_results):
+            if hasattr(stream, "protect"):
+                stream.protect(first_word)
+        shown_lines = min(self.settings.visible_lines, len(layout.lines))
+        self.dirty_rects.append(pygame.Rect(0, layout.text_top(), screen_width, shown_lines * layout.line_height()))
+        blit_sequence = []
+        for i in range(first_word, last_word):
+            word = mode.words[i]
+            x, y = layout.word_position(i)
             if i < mode.current_word_index:
                 color = self.settings.correct_color if mode.finished_word_results[i] else self.settings.error_color
-                surfaces = [self.font.render(c, True, color) for c in word]
+                for c in word:
+                    x += self.queue_glyph(blit_sequence, c, color, x, y)
             elif i == mode.current_word_index:
-                surfaces = []
                 for j, c in enumerate(word):
                     if j < len(mode.user_input):
                         color = self.settings.correct_color if mode.user_input[j] == c else self.settings.error_color
                     else:
                         color = self.settings.text_color
-                    surfaces.append(self.font.render(c, True, color))
+                    x += self.queue_glyph(blit_sequence, c, color, x, y)
             else:
-                surfaces = [self.font.render(c, True, self.settings.text_color) for c in word]
-
-            word_width = sum(s.get_width() for s in surfaces)
-            if current_line and current_line_width + space_width + word_width > max_line_width:
-                lines.append((current_line, current_line_width))
-                current_line = []
-                current_line_width = 0
-            if current_line:
-                current_line_width += space_width
-            current_line.append((word, surfaces, i))
-            current_line_width += word_width
-        if current_line:
-            lines.append((current_line, current_line_width))
-
-        total_text_height = len(lines) * (self.settings.font_size + 15)
-        start_y = (screen_height - total_text_height) // 2
-
-        for line, line_width in lines:
-            start_x = (screen_width - line_width) // 2
-            x = start_x
-            for word, surfaces, idx in line:
-                for surf in surfaces:
-                    self.screen.blit(surf, (x, start_y))
-                    x += surf.get_width()
-                x += space_width
-            start_y += self.settings.font_size + 15
-
-        for line, line_width in lines:
-            for word, surfaces, idx in line:
-                if idx == mode.current_word_index:
-                    start_x = (screen_width - line_width) // 2
-                    for w, surfs, jdx in line:
-                        if jdx == mode.current_word_index:
-                            break
-                        start_x += sum(s.get_width() for s in surfs) + space_width
-                    typed_width = 0
-                    current_word = mode.words[mode.current_word_index]
-                    for j in range(len(mode.user_input)):
-                        if j < len(current_word):
-                            ch_surf = self.font.render(current_word[j], True,
-                                                       self.settings.correct_color if mode.user_input[j] ==
-                                                                                      current_word[
-                                                                                          j] else self.settings.error_color)
-                            typed_width += ch_surf.get_width()
-                    cursor_x = start_x + typed_width
-                    line_index = lines.index((line, line_width))
-                    cursor_y = (screen_height - total_text_height) // 2 + line_index * (self.settings.font_size + 15)
-                    cursor_surface = pygame.Surface((3, self.settings.font_size), pygame.SRCALPHA)
-                    cursor_surface.fill((self.settings.text_color[0], self.settings.text_color[1],
-                                         self.settings.text_color[2], self.cursor_alpha))
-                    self.screen.blit(cursor_surface, (cursor_x, cursor_y))
-                    break
+                for c in word:
+                    x += self.queue_glyph(blit_sequence, c, self.settings.text_color, x, y)
+        self.screen.blits(blit_sequence, doreturn=False)
+
+        if mode.current_word_index < len(mode.words):
+            cursor_x, cursor_y = layout.word_position(mode.current_word_index)
+            current_word = mode.words[mode.current_word_index]
+            for j in range(min(len(mode.user_input), len(current_word))):
+                color = (self.settings.correct_color if mode.user_input[j] == current_word[j]
+                         else self.settings.error_color)
+                cursor_x += glyphs.width(self.font, current_word[j], color)
+            if self.cursor_surface_alpha != self.cursor_alpha:
+                self.cursor_surface.fill((self.settings.text_color[0], self.settings.text_color[1],
+                                          self.settings.text_color[2], self.cursor_alpha))
+                self.cursor_surface_alpha = self.cursor_alpha
+            self.screen.blit(self.cursor_surface, (cursor_x, cursor_y))
 
         if hasattr(mode, 'time_limit') and mode.time_limit > 0:
             remaining_time = max(0, mode.time_limit - mode.time_elapsed)
             timer_text = f"Time left: {int(remaining_time)}s"
-            timer_surface = self.menu_font.render(timer_text, True, self.settings.text_color)
-            self.screen.blit(timer_surface, (screen_width - 200, 20))
+            timer_surface = self.text_cache.render("timer", self.menu_font, timer_text, self.settings.text_color)
+            self.blit(timer_surface, (screen_width - 200, 20))
+
+        if self.settings.show_live_stats and mode.live_stats.start is not None:
+            live = mode.live_stats.snapshot(None if mode.finished else mode.clock())
+            live_text = (f"WPM {int(live['wpm'])}  Raw {int(live['raw_wpm'])}  "
+                         f"Acc {int(live['accuracy'])}%  Burst {int(live['burst'])}")
+            live_surface = self.text_cache.render("live_stats", self.menu_font, live_text, self.settings.text_color)
+            self.blit(live_surface, (50, 20))
 
         if hasattr(mode, 'word_count') and mode.word_count > 0:
             remaining_words = max(0, mode.word_count - mode.current_word_index)
             words_text = f"Words left: {remaining_words}"
-            words_surface = self.menu_font.render(words_text, True, self.settings.text_color)
-            self.screen.blit(words_surface, (screen_width - 200, 50))
+            words_surface = self.text_cache.render("words_left", self.menu_font, words_text, self.settings.text_color)
+            self.blit(words_surface, (screen_width - 200, 50))
 
         restart_text = "Shift + Enter для перезапуска"
-        restart_surface = self.menu_font.render(restart_text, True, (100, 100, 100))
-        self.screen.blit(restart_surface, (50, screen_height - 50))
+        restart_surface = self.text_cache.render("restart_hint", self.menu_font, restart_text, (100, 100, 100))
+        self.blit(restart_surface, (50, screen_height - 50))
         esc_text = "Нажмите ESC для выхода в меню"
-        esc_surface = self.menu_font.render(esc_text, True, (100, 100, 100))
-        self.screen.blit(esc_surface, (50, screen_height - 100))
+        esc_surface = self.text_cache.render("esc_hint", self.menu_font, esc_text, (100, 100, 100))
+        self.blit(esc_surface, (50, screen_height - 100))
+
+    def queue_glyph(self, blit_sequence, char, color, x, y):
+        if self.glyph_atlas:
+            area = self.glyph_atlas.area(char, color)
+            if area:
+                blit_sequence.append((self.glyph_atlas.surface, (x, y), area))
+                return area.width
+        surface = self.glyph_cache.get(self.font, char, color)
+        blit_sequence.append((surface, (x, y)))
+        return surface.get_width()
 
     def draw_custom_setup(self):
-        prompt_text = "Введите настройки для Custom Mode (например: time=30 words=50) и нажмите Enter:"
-        prompt_surface = self.menu_font.render(prompt_text, True, self.settings.text_color)
-        self.screen.blit(prompt_surface, (50, 150))
-        input_surface = self.menu_font.render(self.input_text, True, (255, 255, 0))
-        self.screen.blit(input_surface, (50, 220))
+        prompt_text = "Введите настройки для Custom Mode (например: time=30 words=50 или book=путь time=60) и нажмите Enter:"
+        prompt_surface = self.text_cache.render("custom_prompt", self.menu_font, prompt_text, self.settings.text_color)
+        self.blit(prompt_surface, (50, 150))
+        input_surface = self.text_cache.render("custom_input", self.menu_font, self.input_text, (255, 255, 0))
+        self.blit(input_surface, (50, 220))
 
     def draw_parameter_selection(self):
         panel_rect = pygame.Rect(0, self.panel_y, self.screen.get_width(), 200)
-        pygame.draw.rect(self.screen, (50, 50, 50), panel_rect, border_radius=8)
+        self.draw_rect((50, 50, 50), panel_rect, border_radius=8)
 
         for btn in self.parameter_buttons:
             if btn[0] == "label":
-                self.screen.blit(btn[2], (btn[1].left, self.panel_y + btn[1].top))
+                self.blit(btn[2], (btn[1].left, self.panel_y + btn[1].top))
             else:
                 rect = btn[1]
                 actual_rect = rect.copy()
                 actual_rect.y += self.panel_y
                 bg_color = self.settings.menu_button_color
-                if actual_rect.collidepoint(pygame.mouse.get_pos()):
+                if self.hovered == btn[0]:
                     bg_color = self.settings.menu_button_hover_color
-                pygame.draw.rect(self.screen, bg_color, actual_rect, border_radius=8)
-                text_surface = self.menu_font.render(btn[0], True, self.settings.menu_button_text_color)
-                text_rect = text_surface.get_rect(center=actual_rect.center)
-                self.screen.blit(text_surface, text_rect)
+                self.draw_rect(bg_color, actual_rect, border_radius=8)
+                text_rect = btn[2].get_rect(center=actual_rect.center)
+                self.blit(btn[2], text_rect)
 
     def parse_custom_input(self):
         time_limit = 0
         word_count = 0
+        book_path = None
         parts = self.input_text.split()
         for part in parts:
             if "=" in part:
@@ -408,7 +478,12 @@ class UI:
                         time_limit = int(value)
                     elif key == "words":
                         word_count = int(value)
+                    elif key == "book":
+                        book_path = value
                 except ValueError:
                     pass
-        self.game_manager.set_mode("custom", time_limit, word_count)
+        if book_path:
+            self.game_manager.set_mode("book", book_path, time_limit)
+        else:
+            self.game_manager.set_mode("custom", time_limit, word_count)
         self.input_text = ""